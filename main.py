@@ -118,6 +118,16 @@ Examples:
         help='Detection confidence threshold (0.0-1.0, default: 0.5)'
     )
     
+    parser.add_argument(
+        '--backend',
+        type=str,
+        choices=['pt', 'engine', 'onnx', 'openvino_int8'],
+        default='pt',
+        help='Inference backend: pt (PyTorch), engine (TensorRT), onnx (ONNX Runtime) or '
+             'openvino_int8 (INT8 OpenVINO for CPU); '
+             'exported models are created next to --model on first use (default: pt)'
+    )
+    
     parser.add_argument(
         '--enhance-night',
         action='store_true',
@@ -303,7 +313,8 @@ def main():
             model_path=args.model,
             confidence_threshold=args.confidence,
             error_handler=error_handler,
-            enhance_night=args.enhance_night
+            enhance_night=args.enhance_night,
+            backend=args.backend
         )
         night_mode = " (night enhancement ON)" if args.enhance_night else ""
         print(f"✓ Enhanced detector initialized{night_mode}")
@@ -637,23 +648,21 @@ def main():
             current_states = signal_controller.get_current_states()
             remaining_times = signal_controller.get_remaining_times()
             
-            # Visualize results
-            annotated_frame = frame
-            
-            # Draw detections
-            annotated_frame = visualizer.draw_detections_enhanced(annotated_frame, detection_result)
+            # Visualize results: the first overlay copies the frame once, and
+            # the rest draw on that copy in place
+            annotated_frame = visualizer.draw_detections_enhanced(frame, detection_result)
             
             # Draw heatmap (if enabled)
             if args.enable_heatmap:
-                annotated_frame = visualizer.draw_heatmap(annotated_frame, densities)
+                annotated_frame = visualizer.draw_heatmap(annotated_frame, densities, inplace=True)
             
             # Draw trajectories (if enabled)
             if args.enable_trajectories and tracked_objects:
-                annotated_frame = visualizer.draw_trajectories(annotated_frame, tracked_objects)
+                annotated_frame = visualizer.draw_trajectories(annotated_frame, tracked_objects, inplace=True)
             
             # Draw queue visualization (if enabled)
             if queue_metrics:
-                annotated_frame = visualizer.draw_queue_visualization(annotated_frame, queue_metrics)
+                annotated_frame = visualizer.draw_queue_visualization(annotated_frame, queue_metrics, inplace=True)
             
             # Draw signal panel
             current_plan = signal_controller.get_current_plan()
@@ -662,7 +671,8 @@ def main():
                 annotated_frame,
                 current_states,
                 phases,
-                remaining_times
+                remaining_times,
+                inplace=True
             )
             
             # Draw metrics overlay
@@ -673,7 +683,7 @@ def main():
                 'emergency': len(detection_result.emergency_vehicles),
                 'tracked': len(tracked_objects) if tracked_objects else 0
             }
-            annotated_frame = visualizer.draw_metrics_overlay(annotated_frame, metrics)
+            annotated_frame = visualizer.draw_metrics_overlay(annotated_frame, metrics, inplace=True)
             
             # Update dashboard (if enabled)
             if dashboard:
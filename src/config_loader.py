@@ -104,7 +104,7 @@ class CrosswalkConfig:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class SignalTimingConfig:
     """Signal timing parameters."""
     minimum_green: int = 10
@@ -125,7 +125,7 @@ class SignalTimingConfig:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class DetectionConfig:
     """Detection and tracking configuration."""
     model_path: str = "yolov8n.pt"
@@ -142,6 +142,13 @@ class DetectionConfig:
         )
 
 
+# Shared defaults for intersections that do not override these sections.
+# The timing and detection configs are frozen, so one instance can back
+# every intersection in a network.
+_DEFAULT_SIGNAL_TIMING = SignalTimingConfig()
+_DEFAULT_DETECTION = DetectionConfig()
+
+
 @dataclass
 class IntersectionConfig:
     """Configuration for a single intersection."""
@@ -151,8 +158,8 @@ class IntersectionConfig:
     lanes: Dict[str, LaneConfig]
     turn_lanes: Dict[str, TurnLaneConfig] = field(default_factory=dict)
     crosswalks: Dict[str, CrosswalkConfig] = field(default_factory=dict)
-    signal_timing: SignalTimingConfig = field(default_factory=SignalTimingConfig)
-    detection: DetectionConfig = field(default_factory=DetectionConfig)
+    signal_timing: SignalTimingConfig = _DEFAULT_SIGNAL_TIMING
+    detection: DetectionConfig = _DEFAULT_DETECTION
     vehicle_weights: Dict[str, float] = field(default_factory=dict)
     
     @classmethod
@@ -161,6 +168,51 @@ class IntersectionConfig:
         # Parse intersection metadata
         intersection_data = data.get('intersection', {})
         
+        # Parse vehicle weights
+        vehicle_weights = data.get('vehicle_weights', {
+            'car': 1.0,
+            'truck': 1.5,
+            'bus': 2.0,
+            'motorcycle': 0.8,
+            'bicycle': 0.5
+        })
+        
+        return cls._from_sections(
+            data,
+            intersection_id=intersection_data.get('id', 'default_intersection'),
+            name=intersection_data.get('name', 'Unnamed Intersection'),
+            video_source=intersection_data.get('video_source', ''),
+            vehicle_weights=vehicle_weights
+        )
+    
+    @classmethod
+    def from_network_entry(cls, int_id: str, int_data: Dict[str, Any]) -> 'IntersectionConfig':
+        """
+        Create IntersectionConfig from an entry of a network's intersections map.
+        
+        Network entries keep the intersection metadata at the top level instead
+        of under an 'intersection' key, so they are read directly rather than
+        being reshaped into a single-intersection dictionary first.
+        
+        Args:
+            int_id: Key of the entry in the network's intersections map
+            int_data: Intersection entry from the network configuration
+        
+        Returns:
+            IntersectionConfig object
+        """
+        return cls._from_sections(
+            int_data,
+            intersection_id=int_data.get('id', int_id),
+            name=int_data.get('name', int_id),
+            video_source=int_data.get('video_source', ''),
+            vehicle_weights=int_data.get('vehicle_weights', {})
+        )
+    
+    @classmethod
+    def _from_sections(cls, data: Dict[str, Any], intersection_id: str, name: str,
+                       video_source: str, vehicle_weights: Dict[str, float]) -> 'IntersectionConfig':
+        """Parse the lane, timing and detection sections shared by both layouts."""
         # Parse lanes
         lanes = {}
         for lane_name, lane_data in data.get('lanes', {}).items():
@@ -176,25 +228,18 @@ class IntersectionConfig:
         for crosswalk_name, crosswalk_data in data.get('crosswalks', {}).items():
             crosswalks[crosswalk_name] = CrosswalkConfig.from_dict(crosswalk_data)
         
-        # Parse signal timing
-        signal_timing = SignalTimingConfig.from_dict(data.get('signal_timing', {}))
+        # Parse signal timing, sharing the default instance when not overridden
+        timing_data = data.get('signal_timing')
+        signal_timing = SignalTimingConfig.from_dict(timing_data) if timing_data else _DEFAULT_SIGNAL_TIMING
         
         # Parse detection config
-        detection = DetectionConfig.from_dict(data.get('detection', {}))
-        
-        # Parse vehicle weights
-        vehicle_weights = data.get('vehicle_weights', {
-            'car': 1.0,
-            'truck': 1.5,
-            'bus': 2.0,
-            'motorcycle': 0.8,
-            'bicycle': 0.5
-        })
+        detection_data = data.get('detection')
+        detection = DetectionConfig.from_dict(detection_data) if detection_data else _DEFAULT_DETECTION
         
         return cls(
-            id=intersection_data.get('id', 'default_intersection'),
-            name=intersection_data.get('name', 'Unnamed Intersection'),
-            video_source=intersection_data.get('video_source', ''),
+            id=intersection_id,
+            name=name,
+            video_source=video_source,
             lanes=lanes,
             turn_lanes=turn_lanes,
             crosswalks=crosswalks,
@@ -262,21 +307,7 @@ class NetworkConfig:
         # Parse intersections
         intersections = {}
         for int_id, int_data in data.get('intersections', {}).items():
-            # Create a full intersection config from the network data
-            full_int_data = {
-                'intersection': {
-                    'id': int_data.get('id', int_id),
-                    'name': int_data.get('name', int_id),
-                    'video_source': int_data.get('video_source', '')
-                },
-                'lanes': int_data.get('lanes', {}),
-                'turn_lanes': int_data.get('turn_lanes', {}),
-                'crosswalks': int_data.get('crosswalks', {}),
-                'signal_timing': int_data.get('signal_timing', {}),
-                'detection': int_data.get('detection', {}),
-                'vehicle_weights': int_data.get('vehicle_weights', {})
-            }
-            intersections[int_id] = IntersectionConfig.from_dict(full_int_data)
+            intersections[int_id] = IntersectionConfig.from_network_entry(int_id, int_data)
         
         # Parse connections
         connections = []
@@ -4,7 +4,8 @@ Emergency Priority Handler Module for SMART FLOW v2
 Detects and prioritizes emergency vehicles.
 """
 
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Tuple, Iterator, Sequence
+from collections import abc
 from dataclasses import dataclass
 import time
 
@@ -27,6 +28,45 @@ class SignalPlan:
     timestamp: float
 
 
+class ReadOnlyList(abc.Sequence):
+    """
+    Read-only view over a list.
+    
+    Indexing, iteration and len() are delegated to the wrapped list without
+    copying it; the view has no mutating methods, so item assignment or
+    append() on it raises.
+    """
+    
+    __slots__ = ('_items',)
+    
+    def __init__(self, items: list):
+        self._items = items
+    
+    def __getitem__(self, index):
+        return self._items[index]
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+    
+    def __eq__(self, other) -> bool:
+        # Compares equal to any non-string sequence with equal items, so
+        # callers can keep comparing the history against plain lists
+        if isinstance(other, ReadOnlyList):
+            other = other._items
+        if not isinstance(other, abc.Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(other) == len(self._items) and all(a == b for a, b in zip(self._items, other))
+    
+    # The wrapped list can change, so the view is unhashable like a list
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"ReadOnlyList({self._items!r})"
+
+
 class EmergencyPriorityHandler:
     """
     Handles emergency vehicle detection and priority.
@@ -235,14 +275,18 @@ class EmergencyPriorityHandler:
         self._active_emergency = None
         self._emergency_start_time = None
     
-    def get_emergency_history(self) -> List[EmergencyEvent]:
+    def get_emergency_history(self) -> Sequence[EmergencyEvent]:
         """
         Get history of all emergency events.
         
+        The history is returned as a read-only view rather than a copy, so it
+        reflects events activated after the call. Use list() on the result to
+        take a snapshot.
+        
         Returns:
-            List of EmergencyEvent objects
+            Read-only sequence of EmergencyEvent objects
         """
-        return self._emergency_history.copy()
+        return ReadOnlyList(self._emergency_history)
     
     def _is_emergency_detection(self, detection) -> bool:
         """
@@ -8,19 +8,70 @@ Extends vehicle detection to include:
 - Object tracking across frames
 """
 
-from typing import List, Optional, Dict, Tuple
+from collections import abc
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Literal, Optional, Dict, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import numpy as np
+import torch
+from scipy.optimize import linear_sum_assignment
 from ultralytics import YOLO
 import time
 import logging
 
 from src.error_handler import ErrorHandler, ErrorSeverity
 
+# Numba is optional; without it small cost matrices use the NumPy path too
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _fill_cost_matrix(track_bboxes: np.ndarray, det_bboxes: np.ndarray,
+                      track_centers: np.ndarray, det_centers: np.ndarray,
+                      iou: np.ndarray, cost: np.ndarray) -> None:
+    """
+    Scalar-loop version of SimpleTracker._cost_matrix.
+    
+    Writes the (N, M) IoU and cost matrices into the given output arrays.
+    Compiled with Numba when available; for a handful of tracks and
+    detections this beats NumPy broadcasting, whose temporaries dominate
+    at that size.
+    """
+    n = track_bboxes.shape[0]
+    m = det_bboxes.shape[0]
+    for i in range(n):
+        tx1, ty1, tx2, ty2 = track_bboxes[i, 0], track_bboxes[i, 1], track_bboxes[i, 2], track_bboxes[i, 3]
+        track_area = (tx2 - tx1) * (ty2 - ty1)
+        for j in range(m):
+            dx1, dy1, dx2, dy2 = det_bboxes[j, 0], det_bboxes[j, 1], det_bboxes[j, 2], det_bboxes[j, 3]
+            x_left = max(tx1, dx1)
+            y_top = max(ty1, dy1)
+            x_right = min(tx2, dx2)
+            y_bottom = min(ty2, dy2)
+            pair_iou = 0.0
+            if x_right > x_left and y_bottom > y_top:
+                intersection = (x_right - x_left) * (y_bottom - y_top)
+                union = track_area + (dx2 - dx1) * (dy2 - dy1) - intersection
+                if union > 0:
+                    pair_iou = intersection / union
+            ddx = track_centers[i, 0] - det_centers[j, 0]
+            ddy = track_centers[i, 1] - det_centers[j, 1]
+            iou[i, j] = pair_iou
+            cost[i, j] = -pair_iou + np.sqrt(ddx * ddx + ddy * ddy) / 1000.0
+
+
+if NUMBA_AVAILABLE:
+    _fill_cost_matrix = njit(cache=True, fastmath=True)(_fill_cost_matrix)
+_jit_warmed_up = False
+
+
 class VehicleType(Enum):
     """Vehicle type classifications"""
     CAR = "car"
@@ -40,12 +91,148 @@ class Detection:
     confidence: float
     class_id: int
     class_name: str
-    center: Tuple[int, int] = field(init=False)
+    center: Optional[Tuple[int, int]] = None  # Computed from bbox unless given (e.g. precomputed in bulk)
+    _is_emergency: Optional[bool] = field(default=None, init=False, repr=False, compare=False)  # Cached by EnhancedDetector.is_emergency_vehicle
     
     def __post_init__(self):
         """Calculate center point after initialization"""
-        x, y, w, h = self.bbox
-        self.center = (x + w // 2, y + h // 2)
+        if self.center is None:
+            x, y, w, h = self.bbox
+            self.center = (x + w // 2, y + h // 2)
+
+
+@dataclass
+class DetectionBatch:
+    """
+    Structure-of-arrays view of the detections in a frame.
+    
+    Keeps boxes, centers, confidences and class ids in contiguous arrays so
+    vectorized consumers (e.g. the tracker) never unpack per-object tuples.
+    Use view(i) to get a Detection for legacy callers; views are built on
+    first access and cached.
+    """
+    bboxes: np.ndarray  # (N, 4) rows of (x, y, width, height)
+    centers: np.ndarray  # (N, 2) rows of (x, y)
+    confidences: np.ndarray  # (N,)
+    class_ids: np.ndarray  # (N,)
+    class_names: List[str]
+    _views: List[Optional[Detection]] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Prepare the lazy Detection cache"""
+        if self._views is None:
+            self._views = [None] * len(self.class_names)
+    
+    def __len__(self) -> int:
+        return len(self.class_names)
+    
+    @classmethod
+    def from_detections(cls, detections: List[Detection]) -> 'DetectionBatch':
+        """Build a batch from Detection objects, reusing them as the views."""
+        return cls(
+            bboxes=np.array([d.bbox for d in detections], dtype=np.int64).reshape(-1, 4),
+            centers=np.array([d.center for d in detections], dtype=np.int64).reshape(-1, 2),
+            confidences=np.array([d.confidence for d in detections], dtype=np.float32),
+            class_ids=np.array([d.class_id for d in detections], dtype=np.int32),
+            class_names=[d.class_name for d in detections],
+            _views=list(detections)
+        )
+    
+    def view(self, i: int) -> Detection:
+        """Get detection i as a Detection object."""
+        detection = self._views[i]
+        if detection is None:
+            detection = Detection(
+                bbox=tuple(self.bboxes[i].tolist()),
+                confidence=float(self.confidences[i]),
+                class_id=int(self.class_ids[i]),
+                class_name=self.class_names[i],
+                center=tuple(self.centers[i].tolist())
+            )
+            self._views[i] = detection
+        return detection
+
+
+@dataclass
+class TrajectoryBuffer:
+    """
+    Recent (x, y) centers of one track in a preallocated int32 buffer.
+    
+    Points are appended after the ones already written and never overwritten:
+    once the buffer is full, the retained points move to a fresh array. Views
+    returned by points() therefore stay valid after later appends, so tracked
+    objects can share them without copying.
+    """
+    buf: np.ndarray  # (2 * capacity, 2) int32; retained points are rows [end - length, end)
+    capacity: int  # most points retained
+    end: int = 0  # rows of buf written so far
+    length: int = 0  # points retained
+    
+    @classmethod
+    def with_capacity(cls, capacity: int) -> 'TrajectoryBuffer':
+        """Create an empty buffer keeping up to capacity points."""
+        return cls(buf=np.empty((2 * capacity, 2), dtype=np.int32), capacity=capacity)
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def append(self, point: Tuple[int, int]) -> None:
+        """Add a point, dropping the oldest one once capacity points are retained."""
+        if self.end == self.buf.shape[0]:
+            # Move the points that stay into a new array; views of the old one
+            # remain intact
+            keep = self.capacity - 1
+            buf = np.empty_like(self.buf)
+            buf[:keep] = self.buf[self.end - keep:self.end]
+            self.buf = buf
+            self.end = keep
+            self.length = min(self.length, keep)
+        self.buf[self.end] = point
+        self.end += 1
+        self.length = min(self.length + 1, self.capacity)
+    
+    def points(self) -> np.ndarray:
+        """Retained points, oldest first, as a read-only (N, 2) view."""
+        view = self.buf[self.end - self.length:self.end]
+        view.flags.writeable = False
+        return view
+
+
+class Trajectory(abc.Sequence):
+    """
+    Read-only (x, y) positions of a tracked object, oldest first.
+    
+    Backed by an (N, 2) int32 array, exposed as ``points`` for drawing with
+    OpenCV; items are (x, y) tuples, and the trajectory compares equal to any
+    sequence of the same positions, like the list it replaces.
+    """
+    
+    __slots__ = ('points',)
+    
+    def __init__(self, points: np.ndarray):
+        self.points = points
+    
+    def __len__(self) -> int:
+        return self.points.shape[0]
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [tuple(point) for point in self.points[index].tolist()]
+        return tuple(self.points[index].tolist())
+    
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return map(tuple, self.points.tolist())
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, abc.Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+    
+    # The positions can be rebuilt, but a list would not be hashable either
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"Trajectory({list(self)!r})"
 
 
 @dataclass
@@ -55,6 +242,7 @@ class DetectionResult:
     pedestrians: List[Detection]
     emergency_vehicles: List[Detection]
     timestamp: float
+    batch: Optional[DetectionBatch] = field(default=None, repr=False, compare=False)  # All kept detections as arrays
 
 
 @dataclass
@@ -62,7 +250,7 @@ class TrackedObject:
     """Object tracked across frames"""
     object_id: int
     detection: Detection
-    trajectory: List[Tuple[int, int]]  # List of (x, y) positions
+    trajectory: Sequence[Tuple[int, int]]  # (x, y) positions, a Trajectory when built by the tracker
     velocity: Tuple[float, float]  # (vx, vy) pixels per second
     age: int  # frames since first detection
 
@@ -71,8 +259,18 @@ class SimpleTracker:
     """
     Simple object tracker using IoU and centroid distance.
     Implements a lightweight tracking algorithm suitable for traffic scenarios.
+    Detections are assigned to tracks with the Hungarian algorithm.
     """
     
+    # Added to gated-out pairs so the solver only uses them when unavoidable
+    INVALID_MATCH_COST = 1e3
+    
+    # Below this many track/detection pairs the compiled scalar loop is used
+    JIT_MAX_PAIRS = 64
+    
+    # Most recent centers kept per track; bounds each track's trajectory buffer
+    TRAJECTORY_LENGTH = 60
+    
     def __init__(self, max_age: int = 30, min_hits: int = 3, iou_threshold: float = 0.3):
         """
         Initialize tracker.
@@ -88,13 +286,31 @@ class SimpleTracker:
         self.tracks: Dict[int, Dict] = {}
         self.next_id = 0
         self.frame_count = 0
+        # Reusable IoU/cost buffers, grown by doubling and sliced per frame
+        self._iou_buf = np.empty((16, 16), dtype=np.float32)
+        self._cost_buf = np.empty((16, 16), dtype=np.float32)
+        self._warm_up_jit()
+    
+    @staticmethod
+    def _warm_up_jit() -> None:
+        """Compile the Numba cost kernel once per process, off the first frame's path."""
+        global _jit_warmed_up
+        if NUMBA_AVAILABLE and not _jit_warmed_up:
+            boxes = np.zeros((2, 4), dtype=np.float32)
+            centers = np.zeros((2, 2), dtype=np.float32)
+            # Outputs are slices of the reusable buffers, which may or may not be
+            # contiguous; compile both layouts
+            buffer = np.zeros((2, 4), dtype=np.float32)
+            _fill_cost_matrix(boxes[:1], boxes, centers[:1], centers, buffer[:1, :2], buffer[1:, :2])
+            _fill_cost_matrix(boxes[:1], boxes, centers[:1], centers, buffer[:1, ::2], buffer[1:, ::2])
+            _jit_warmed_up = True
     
-    def update(self, detections: List[Detection], fps: float = 30.0) -> List[TrackedObject]:
+    def update(self, detections: Union[List[Detection], DetectionBatch], fps: float = 30.0) -> List[TrackedObject]:
         """
         Update tracks with new detections.
         
         Args:
-            detections: List of detections in current frame
+            detections: Detections in current frame, as a list or a DetectionBatch
             fps: Frame rate for velocity calculation
             
         Returns:
@@ -109,41 +325,44 @@ class SimpleTracker:
         for track_id, detection in matched_tracks.items():
             track = self.tracks[track_id]
             track['detections'].append(detection)
+            track['last_bbox'], track['last_center'] = self._box_arrays(detection)
             track['age'] = 0
             track['hits'] += 1
             
             # Update trajectory
-            track['trajectory'].append(detection.center)
+            trajectory = track['trajectory']
+            trajectory.append(detection.center)
             
             # Calculate velocity (pixels per second)
-            if len(track['trajectory']) >= 2:
+            if len(trajectory) >= 2:
                 dt = 1.0 / fps
-                dx = track['trajectory'][-1][0] - track['trajectory'][-2][0]
-                dy = track['trajectory'][-1][1] - track['trajectory'][-2][1]
-                track['velocity'] = (dx / dt, dy / dt)
+                (x0, y0), (x1, y1) = trajectory.points()[-2:].tolist()
+                track['velocity'] = ((x1 - x0) / dt, (y1 - y0) / dt)
         
         # Create new tracks for unmatched detections
         for detection in unmatched_detections:
+            last_bbox, last_center = self._box_arrays(detection)
+            trajectory = TrajectoryBuffer.with_capacity(self.TRAJECTORY_LENGTH)
+            trajectory.append(detection.center)
             self.tracks[self.next_id] = {
                 'detections': [detection],
-                'trajectory': [detection.center],
+                'last_bbox': last_bbox,
+                'last_center': last_center,
+                'trajectory': trajectory,
                 'velocity': (0.0, 0.0),
                 'age': 0,
                 'hits': 1
             }
             self.next_id += 1
         
-        # Age unmatched tracks
-        tracks_to_remove = []
-        for track_id in self.tracks:
+        # Age unmatched tracks (matched_tracks is a dict, so membership is O(1))
+        for track_id, track in self.tracks.items():
             if track_id not in matched_tracks:
-                self.tracks[track_id]['age'] += 1
-                if self.tracks[track_id]['age'] > self.max_age:
-                    tracks_to_remove.append(track_id)
+                track['age'] += 1
         
         # Remove old tracks
-        for track_id in tracks_to_remove:
-            del self.tracks[track_id]
+        max_age = self.max_age
+        self.tracks = {track_id: track for track_id, track in self.tracks.items() if track['age'] <= max_age}
         
         # Build tracked objects list
         tracked_objects = []
@@ -152,67 +371,138 @@ class SimpleTracker:
                 tracked_objects.append(TrackedObject(
                     object_id=track_id,
                     detection=track['detections'][-1],
-                    trajectory=track['trajectory'].copy(),
+                    # Shares the buffer's rows; later appends never overwrite them
+                    trajectory=Trajectory(track['trajectory'].points()),
                     velocity=track['velocity'],
                     age=self.frame_count - len(track['detections']) + 1
                 ))
         
         return tracked_objects
     
-    def _match_detections(self, detections: List[Detection]) -> Tuple[Dict[int, Detection], List[Detection]]:
+    def _match_detections(self, detections: Union[List[Detection], DetectionBatch]) -> Tuple[Dict[int, Detection], List[Detection]]:
         """
         Match detections to existing tracks using IoU and distance.
         
         Args:
-            detections: List of detections to match
+            detections: Detections to match, as a list or a DetectionBatch
             
         Returns:
             Tuple of (matched_tracks dict, unmatched_detections list)
         """
-        if not self.tracks or not detections:
-            return {}, detections
+        batch = detections if isinstance(detections, DetectionBatch) else DetectionBatch.from_detections(detections)
+        
+        if not self.tracks or not len(batch):
+            return {}, [batch.view(j) for j in range(len(batch))]
         
         # Calculate cost matrix (negative IoU + distance penalty)
         track_ids = list(self.tracks.keys())
-        cost_matrix = np.zeros((len(track_ids), len(detections)))
+        tracks = self.tracks.values()
+        track_bboxes = np.stack([track['last_bbox'] for track in tracks])
+        track_centers = np.stack([track['last_center'] for track in tracks])
+        det_bboxes = self._to_xyxy(batch.bboxes)
+        det_centers = batch.centers.astype(np.float32)
+        iou_matrix, cost_matrix = self._cost_buffers(len(track_ids), len(batch))
+        if NUMBA_AVAILABLE and len(track_ids) * len(batch) < self.JIT_MAX_PAIRS:
+            _fill_cost_matrix(
+                track_bboxes, det_bboxes, track_centers, det_centers,
+                iou_matrix, cost_matrix
+            )
+        else:
+            self._cost_matrix(track_bboxes, det_bboxes, track_centers, det_centers,
+                              out=(iou_matrix, cost_matrix))
         
-        for i, track_id in enumerate(track_ids):
-            last_detection = self.tracks[track_id]['detections'][-1]
-            for j, detection in enumerate(detections):
-                iou = self._calculate_iou(last_detection.bbox, detection.bbox)
-                distance = self._calculate_distance(last_detection.center, detection.center)
-                # Cost is negative IoU plus normalized distance
-                cost_matrix[i, j] = -iou + distance / 1000.0
+        # Optimal assignment; pairs that fail the IoU/cost gate are priced out
+        # so they cannot displace an acceptable match
+        valid = (iou_matrix >= self.iou_threshold) | (cost_matrix < 0.5)
+        gated_cost = np.where(valid, cost_matrix, cost_matrix.max() + self.INVALID_MATCH_COST)
+        row_indices, col_indices = linear_sum_assignment(gated_cost)
         
-        # Simple greedy matching
         matched_tracks = {}
         matched_detection_indices = set()
-        
-        # Sort by cost and match greedily
-        matches = []
-        for i in range(len(track_ids)):
-            for j in range(len(detections)):
-                if j not in matched_detection_indices:
-                    matches.append((cost_matrix[i, j], i, j))
-        
-        matches.sort()
-        
-        for cost, i, j in matches:
-            if i < len(track_ids) and j < len(detections):
-                track_id = track_ids[i]
-                if track_id not in matched_tracks and j not in matched_detection_indices:
-                    # Check if match is good enough
-                    last_detection = self.tracks[track_id]['detections'][-1]
-                    iou = self._calculate_iou(last_detection.bbox, detections[j].bbox)
-                    if iou >= self.iou_threshold or cost < 0.5:
-                        matched_tracks[track_id] = detections[j]
-                        matched_detection_indices.add(j)
+        for i, j in zip(row_indices, col_indices):
+            if valid[i, j]:
+                matched_tracks[track_ids[i]] = batch.view(j)
+                matched_detection_indices.add(j)
         
         # Unmatched detections
-        unmatched_detections = [d for i, d in enumerate(detections) if i not in matched_detection_indices]
+        unmatched_detections = [batch.view(j) for j in range(len(batch)) if j not in matched_detection_indices]
         
         return matched_tracks, unmatched_detections
     
+    @staticmethod
+    def _box_arrays(detection: Detection) -> Tuple[np.ndarray, np.ndarray]:
+        """Get a detection's box as an xyxy array and its center as an array."""
+        x, y, w, h = detection.bbox
+        return (np.array([x, y, x + w, y + h], dtype=np.float32),
+                np.array(detection.center, dtype=np.float32))
+    
+    @staticmethod
+    def _to_xyxy(bboxes: Union[List[Tuple[int, int, int, int]], np.ndarray]) -> np.ndarray:
+        """Convert (x, y, width, height) boxes to a float32 (N, 4) array of (x1, y1, x2, y2)."""
+        boxes = np.array(bboxes, dtype=np.float32).reshape(-1, 4)
+        boxes[:, 2:] += boxes[:, :2]
+        return boxes
+    
+    def _cost_buffers(self, num_tracks: int, num_detections: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get (num_tracks, num_detections) views into the reusable IoU/cost buffers.
+        
+        Buffers grow by doubling when a frame needs more room, so steady-state
+        frames allocate nothing. The views are overwritten on the next call.
+        """
+        rows, cols = self._cost_buf.shape
+        if num_tracks > rows or num_detections > cols:
+            while rows < num_tracks:
+                rows *= 2
+            while cols < num_detections:
+                cols *= 2
+            self._iou_buf = np.empty((rows, cols), dtype=np.float32)
+            self._cost_buf = np.empty((rows, cols), dtype=np.float32)
+        return self._iou_buf[:num_tracks, :num_detections], self._cost_buf[:num_tracks, :num_detections]
+    
+    @staticmethod
+    def _cost_matrix(track_bboxes: np.ndarray, det_bboxes: np.ndarray,
+                     track_centers: np.ndarray, det_centers: np.ndarray,
+                     out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute pairwise IoU and matching cost between tracks and detections.
+        
+        Args:
+            track_bboxes: (N, 4) array of track boxes as (x1, y1, x2, y2)
+            det_bboxes: (M, 4) array of detection boxes as (x1, y1, x2, y2)
+            track_centers: (N, 2) array of track centers
+            det_centers: (M, 2) array of detection centers
+            out: Optional (iou, cost) pair of (N, M) arrays to write into
+            
+        Returns:
+            Tuple of (N, M) IoU matrix and (N, M) cost matrix, where cost is
+            negative IoU plus centroid distance / 1000
+        """
+        num_pairs = (track_bboxes.shape[0], det_bboxes.shape[0])
+        iou, cost = out if out is not None else (np.empty(num_pairs, dtype=np.float32), np.empty(num_pairs, dtype=np.float32))
+        
+        # Intersection by broadcasting (N, 1) against (1, M)
+        x_left = np.maximum(track_bboxes[:, None, 0], det_bboxes[None, :, 0])
+        y_top = np.maximum(track_bboxes[:, None, 1], det_bboxes[None, :, 1])
+        x_right = np.minimum(track_bboxes[:, None, 2], det_bboxes[None, :, 2])
+        y_bottom = np.minimum(track_bboxes[:, None, 3], det_bboxes[None, :, 3])
+        
+        # Most track/detection pairs are disjoint; only divide where boxes overlap
+        overlap = (x_right > x_left) & (y_bottom > y_top)
+        intersection = np.where(overlap, (x_right - x_left) * (y_bottom - y_top), 0.0)
+        
+        track_areas = (track_bboxes[:, 2] - track_bboxes[:, 0]) * (track_bboxes[:, 3] - track_bboxes[:, 1])
+        det_areas = (det_bboxes[:, 2] - det_bboxes[:, 0]) * (det_bboxes[:, 3] - det_bboxes[:, 1])
+        union = track_areas[:, None] + det_areas[None, :] - intersection
+        iou.fill(0.0)
+        np.divide(intersection, union, out=iou, where=overlap & (union > 0))
+        
+        distances = np.linalg.norm(track_centers[:, None, :] - det_centers[None, :, :], axis=2)
+        np.divide(distances, 1000.0, out=cost)
+        cost -= iou
+        
+        return iou, cost
+    
     def _calculate_iou(self, bbox1: Tuple[int, int, int, int], bbox2: Tuple[int, int, int, int]) -> float:
         """Calculate Intersection over Union between two bounding boxes."""
         x1, y1, w1, h1 = bbox1
@@ -254,7 +544,31 @@ class EnhancedDetector:
     # (e.g., color detection, siren detection, specialized models)
     EMERGENCY_KEYWORDS = ['ambulance', 'fire', 'police', 'emergency']
     
-    def __init__(self, model_path: str, confidence_threshold: float = 0.5, error_handler: Optional[ErrorHandler] = None, enhance_night: bool = False):
+    # Exact class names that are always emergency vehicles (checked before keywords)
+    EMERGENCY_NAMES = frozenset({'ambulance', 'fire_truck', 'fire', 'police', 'emergency'})
+    
+    # Classes that may be emergency vehicles depending on size
+    LARGE_VEHICLE_NAMES = frozenset({'truck', 'bus'})
+    EMERGENCY_MIN_AREA = 50000  # Arbitrary threshold for demo
+    
+    # Inference backends; exported ones are created next to the .pt weights on first use
+    BACKENDS = ('pt', 'engine', 'onnx', 'openvino_int8')
+    EXPORT_SUFFIXES = {'engine': '.engine', 'onnx': '.onnx', 'openvino_int8': '_int8_openvino_model'}
+    
+    # Calibration images for INT8 post-training quantization
+    INT8_CALIBRATION_DATA = 'coco128.yaml'
+    
+    # Map YOLO class to VehicleType
+    TYPE_MAPPING = {
+        'car': VehicleType.CAR,
+        'truck': VehicleType.TRUCK,
+        'bus': VehicleType.BUS,
+        'motorcycle': VehicleType.MOTORCYCLE,
+        'bicycle': VehicleType.BICYCLE
+    }
+    
+    def __init__(self, model_path: str, confidence_threshold: float = 0.5, error_handler: Optional[ErrorHandler] = None, enhance_night: bool = False,
+                 fp16: bool = True, backend: Literal['pt', 'engine', 'onnx', 'openvino_int8'] = 'pt', imgsz: int = 640):
         """
         Initialize enhanced detector.
         
@@ -263,7 +577,16 @@ class EnhancedDetector:
             confidence_threshold: Minimum confidence for detections
             error_handler: Optional error handler for comprehensive error management
             enhance_night: Enable night/low-light enhancement preprocessing
+            fp16: Run inference in half precision when a CUDA device is available
+                (ignored on CPU, which always runs FP32)
+            backend: 'pt' for the eager PyTorch model, 'engine' for TensorRT,
+                'onnx' for ONNX Runtime or 'openvino_int8' for INT8-quantized
+                OpenVINO on CPU (exported once from model_path if missing)
+            imgsz: Fixed input size for exported backends
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
         self.model: Optional[YOLO] = None
@@ -272,13 +595,38 @@ class EnhancedDetector:
         self.inference_failures = 0
         self.max_inference_failures = 5
         self.enhance_night = enhance_night
+        self.fp16 = fp16
+        self.half = False
+        self.backend = backend
+        self.imgsz = imgsz
+        self._infer_kwargs: Dict = {}
+        self._clahe = None
+        self._cuda_clahe = None
+        # Keyword matches per class name; YOLO only ever produces a handful of names
+        self._emergency_name_cache: Dict[str, bool] = {}
+        # Preprocessing runs on its own thread so frame N+1 can be enhanced while
+        # frame N is in inference; the single inference worker keeps results in order
+        self._preprocess_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detector-preprocess")
+        self._inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detector-inference")
         self._load_model()
+        if self.enhance_night:
+            self._init_clahe()
     
     def _load_model(self) -> None:
         """Load the YOLO model."""
         try:
-            self.model = YOLO(self.model_path)
-            logger.info(f"YOLO model loaded successfully from {self.model_path}")
+            # ONNX/OpenVINO graphs are exported at fixed FP32/INT8 precision
+            self.half = self.fp16 and torch.cuda.is_available() and self.backend in ('pt', 'engine')
+            self._infer_kwargs = {'verbose': False, 'half': self.half}
+            if self.backend == 'pt':
+                self.model = YOLO(self.model_path)
+            else:
+                self.model = YOLO(self._exported_model_path(), task='detect')
+                # Exported graphs are specialized for one input shape
+                self._infer_kwargs['imgsz'] = self.imgsz
+            self._build_class_id_tables(self.model.names)
+            precision = "INT8" if self.backend == 'openvino_int8' else "FP16" if self.half else "FP32"
+            logger.info(f"YOLO model loaded successfully from {self.model_path} ({self.backend} backend, {precision} inference)")
         except Exception as e:
             error_msg = f"Failed to load YOLO model from {self.model_path}: {e}"
             logger.error(error_msg)
@@ -291,6 +639,71 @@ class EnhancedDetector:
                 )
             raise Exception(error_msg)
     
+    def _exported_model_path(self) -> str:
+        """
+        Get the exported model for the selected backend, exporting it if missing.
+        
+        Export is a one-time cost; the result is saved next to model_path and
+        reused on later runs.
+        """
+        weights = Path(self.model_path)
+        exported = weights.with_name(weights.stem + self.EXPORT_SUFFIXES[self.backend])
+        if exported.exists():
+            return str(exported)
+        
+        export_args = {
+            'format': self.backend,
+            'half': self.fp16 and self.backend == 'engine',
+            'dynamic': False,
+            'imgsz': self.imgsz
+        }
+        if self.backend == 'openvino_int8':
+            # Post-training quantization, calibrated on a small labelled dataset
+            export_args.update(format='openvino', int8=True, data=self.INT8_CALIBRATION_DATA)
+        
+        logger.info(f"Exporting {self.model_path} to {self.backend} (one-time, this can take a while)")
+        return YOLO(self.model_path).export(**export_args)
+    
+    def _build_class_id_tables(self, names) -> None:
+        """
+        Precompute the class ids of each detection category for the model.
+        
+        Lets _parse_results classify a whole frame with np.isin instead of
+        comparing class names per detection.
+        
+        Args:
+            names: Model class names, as a {class_id: name} dict or a list
+        """
+        items = names.items() if isinstance(names, dict) else enumerate(names)
+        pedestrian_ids, vehicle_ids, emergency_ids, large_vehicle_ids = [], [], [], []
+        for class_id, class_name in items:
+            lowered = class_name.lower()
+            if class_name == self.PEDESTRIAN_CLASS:
+                pedestrian_ids.append(class_id)
+            if class_name in self.VEHICLE_CLASSES:
+                vehicle_ids.append(class_id)
+            if lowered in self.EMERGENCY_NAMES or self._has_emergency_keyword(lowered):
+                emergency_ids.append(class_id)
+            elif lowered in self.LARGE_VEHICLE_NAMES:
+                large_vehicle_ids.append(class_id)
+        
+        self._pedestrian_ids = np.array(pedestrian_ids, dtype=np.int32)
+        self._vehicle_ids = np.array(vehicle_ids, dtype=np.int32)
+        self._emerg_ids = np.array(emergency_ids, dtype=np.int32)
+        self._large_vehicle_ids = np.array(large_vehicle_ids, dtype=np.int32)
+    
+    def _init_clahe(self) -> None:
+        """Create the CLAHE operators used for night preprocessing."""
+        import cv2
+        
+        # Gentle settings to avoid breaking normal detection
+        self._clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(8, 8))
+        
+        # Keep the whole preprocessing pipeline on the GPU when OpenCV was built with CUDA
+        if hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+            self._cuda_clahe = cv2.cuda.createCLAHE(clipLimit=1.5, tileGridSize=(8, 8))
+            logger.info("Night preprocessing running on CUDA")
+    
     def _preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
         """
         Preprocess frame to improve detection in challenging conditions.
@@ -307,14 +720,16 @@ class EnhancedDetector:
         """
         import cv2
         
-        # Gentle contrast enhancement using CLAHE
-        # Less aggressive to avoid breaking normal detection
+        if self._clahe is None:
+            self._init_clahe()
+        
+        if self._cuda_clahe is not None:
+            return self._preprocess_frame_cuda(frame)
+        
+        # Gentle contrast enhancement using CLAHE on the lightness channel
         lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
         l, a, b = cv2.split(lab)
-        
-        # Apply CLAHE with gentle settings
-        clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(8, 8))
-        l_enhanced = clahe.apply(l)
+        l_enhanced = self._clahe.apply(l)
         
         # Merge channels back
         enhanced_lab = cv2.merge([l_enhanced, a, b])
@@ -322,6 +737,27 @@ class EnhancedDetector:
         
         return enhanced_frame
     
+    def _preprocess_frame_cuda(self, frame: np.ndarray) -> np.ndarray:
+        """
+        CUDA version of _preprocess_frame.
+        
+        Uploads the frame once, runs the color conversions and CLAHE on the
+        device, and downloads the result once for inference.
+        """
+        import cv2
+        
+        gpu_frame = cv2.cuda_GpuMat()
+        gpu_frame.upload(frame)
+        
+        gpu_lab = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGR2LAB)
+        l, a, b = cv2.cuda.split(gpu_lab)
+        l_enhanced = self._cuda_clahe.apply(l, cv2.cuda_Stream.Null())
+        
+        gpu_lab = cv2.cuda.merge([l_enhanced, a, b])
+        enhanced = cv2.cuda.cvtColor(gpu_lab, cv2.COLOR_LAB2BGR)
+        
+        return enhanced.download()
+    
     def detect_all(self, frame: np.ndarray, timestamp: Optional[float] = None) -> DetectionResult:
         """
         Detect all objects in frame.
@@ -333,105 +769,241 @@ class EnhancedDetector:
         Returns:
             DetectionResult with vehicles, pedestrians, and emergency vehicles
         """
-        if self.model is None:
-            error_msg = "YOLO model not loaded"
-            logger.error(error_msg)
-            if self.error_handler:
-                self.error_handler.handle_exception(
-                    component="EnhancedDetector",
-                    operation="detect_all",
-                    exception=RuntimeError(error_msg),
-                    severity=ErrorSeverity.CRITICAL
-                )
-            raise RuntimeError(error_msg)
+        self._ensure_model_loaded("detect_all")
         
         if timestamp is None:
             timestamp = time.time()
         
+        # Optionally preprocess frame for better night detection
         try:
-            # Optionally preprocess frame for better night detection
-            if self.enhance_night:
-                processed_frame = self._preprocess_frame(frame)
-            else:
-                processed_frame = frame
+            processed_frame = self._preprocess_frame(frame) if self.enhance_night else frame
+        except Exception as e:
+            self._handle_inference_error(e, "detect_all")
+            return DetectionResult(vehicles=[], pedestrians=[], emergency_vehicles=[], timestamp=timestamp)
+        
+        return self._detect_preprocessed(processed_frame, timestamp, "detect_all")
+    
+    def detect_all_async(self, frame: np.ndarray, timestamp: Optional[float] = None) -> "Future[DetectionResult]":
+        """
+        Detect all objects in frame without blocking the caller.
+        
+        Night preprocessing and inference run on separate worker threads, so
+        submitting frames back to back overlaps preprocessing of the next
+        frame with inference on the current one. Results complete in
+        submission order. Do not mix with concurrent detect_all calls, as
+        the model is not thread-safe.
+        
+        Args:
+            frame: Input frame (numpy array)
+            timestamp: Frame timestamp (defaults to submission time)
             
+        Returns:
+            Future resolving to the frame's DetectionResult
+        """
+        self._ensure_model_loaded("detect_all_async")
+        
+        if timestamp is None:
+            timestamp = time.time()
+        
+        if self.enhance_night:
+            preprocessed = self._preprocess_executor.submit(self._preprocess_frame, frame)
+        else:
+            preprocessed = None
+        
+        def run_inference() -> DetectionResult:
+            try:
+                processed_frame = preprocessed.result() if preprocessed is not None else frame
+            except Exception as e:
+                self._handle_inference_error(e, "detect_all_async")
+                return DetectionResult(vehicles=[], pedestrians=[], emergency_vehicles=[], timestamp=timestamp)
+            return self._detect_preprocessed(processed_frame, timestamp, "detect_all_async")
+        
+        return self._inference_executor.submit(run_inference)
+    
+    def _detect_preprocessed(self, processed_frame: np.ndarray, timestamp: float, operation: str) -> DetectionResult:
+        """Run YOLO on an already preprocessed frame and parse the results."""
+        try:
             # Run YOLO inference
-            results = self.model(processed_frame, verbose=False)
+            results = self.model(processed_frame, **self._infer_kwargs)
             
             # Reset failure counter on successful inference
             self.inference_failures = 0
             
-            vehicles = []
-            pedestrians = []
-            emergency_vehicles = []
+            return self._parse_results(results, timestamp)
             
-            # Process results
-            for result in results:
-                boxes = result.boxes
-                
-                for i in range(len(boxes)):
-                    # Get detection data
-                    box = boxes.xyxy[i].cpu().numpy()  # [x1, y1, x2, y2]
-                    confidence = float(boxes.conf[i].cpu().numpy())
-                    class_id = int(boxes.cls[i].cpu().numpy())
-                    class_name = result.names[class_id]
-                    
-                    # Filter by confidence threshold
-                    if confidence < self.confidence_threshold:
-                        continue
-                    
-                    # Convert to [x, y, width, height] format
-                    x1, y1, x2, y2 = box
-                    x = int(x1)
-                    y = int(y1)
-                    width = int(x2 - x1)
-                    height = int(y2 - y1)
-                    
-                    # Create Detection object
-                    detection = Detection(
-                        bbox=(x, y, width, height),
-                        confidence=confidence,
-                        class_id=class_id,
-                        class_name=class_name
-                    )
-                    
-                    # Classify detection
-                    if class_name == self.PEDESTRIAN_CLASS:
-                        pedestrians.append(detection)
-                    elif class_name in self.VEHICLE_CLASSES:
-                        vehicles.append(detection)
-                        
-                        # Check if it's an emergency vehicle
-                        if self.is_emergency_vehicle(detection):
-                            emergency_vehicles.append(detection)
+        except Exception as e:
+            self._handle_inference_error(e, operation)
             
+            # Return empty result on failure to allow graceful degradation
             return DetectionResult(
-                vehicles=vehicles,
-                pedestrians=pedestrians,
-                emergency_vehicles=emergency_vehicles,
+                vehicles=[],
+                pedestrians=[],
+                emergency_vehicles=[],
                 timestamp=timestamp
             )
+    
+    def detect_all_batch(self, frames: List[np.ndarray], timestamps: Optional[List[float]] = None) -> List[DetectionResult]:
+        """
+        Detect all objects in several frames with a single inference call.
+        
+        Batching frames (e.g. one per camera stream) amortizes the per-call
+        inference overhead across the whole batch.
+        
+        Args:
+            frames: Input frames (numpy arrays)
+            timestamps: Frame timestamps, one per frame (defaults to current time)
+            
+        Returns:
+            One DetectionResult per input frame, in input order
+        """
+        self._ensure_model_loaded("detect_all_batch")
+        
+        if timestamps is None:
+            now = time.time()
+            timestamps = [now] * len(frames)
+        elif len(timestamps) != len(frames):
+            raise ValueError(f"Expected {len(frames)} timestamps, got {len(timestamps)}")
+        
+        if not frames:
+            return []
+        
+        try:
+            if self.enhance_night:
+                processed_frames = [self._preprocess_frame(frame) for frame in frames]
+            else:
+                processed_frames = list(frames)
+            
+            # Ultralytics batches a list of images internally and yields one result per image
+            results = self.model(processed_frames, **self._infer_kwargs)
+            
+            self.inference_failures = 0
+            
+            return [self._parse_results([result], timestamp) for result, timestamp in zip(results, timestamps)]
             
         except Exception as e:
-            self.inference_failures += 1
-            logger.error(f"Error during inference: {e}")
+            self._handle_inference_error(e, "detect_all_batch")
             
+            return [
+                DetectionResult(vehicles=[], pedestrians=[], emergency_vehicles=[], timestamp=timestamp)
+                for timestamp in timestamps
+            ]
+    
+    def close(self) -> None:
+        """Shut down the preprocessing and inference worker threads."""
+        self._preprocess_executor.shutdown(wait=True)
+        self._inference_executor.shutdown(wait=True)
+    
+    def _ensure_model_loaded(self, operation: str) -> None:
+        """Raise RuntimeError (and report it) if the YOLO model is not loaded."""
+        if self.model is None:
+            error_msg = "YOLO model not loaded"
+            logger.error(error_msg)
             if self.error_handler:
-                severity = ErrorSeverity.CRITICAL if self.inference_failures >= self.max_inference_failures else ErrorSeverity.ERROR
                 self.error_handler.handle_exception(
                     component="EnhancedDetector",
-                    operation="detect_all",
-                    exception=e,
-                    severity=severity
+                    operation=operation,
+                    exception=RuntimeError(error_msg),
+                    severity=ErrorSeverity.CRITICAL
                 )
+            raise RuntimeError(error_msg)
+    
+    def _handle_inference_error(self, error: Exception, operation: str) -> None:
+        """Count an inference failure and report it to the error handler."""
+        self.inference_failures += 1
+        logger.error(f"Error during inference: {error}")
+        
+        if self.error_handler:
+            severity = ErrorSeverity.CRITICAL if self.inference_failures >= self.max_inference_failures else ErrorSeverity.ERROR
+            self.error_handler.handle_exception(
+                component="EnhancedDetector",
+                operation=operation,
+                exception=error,
+                severity=severity
+            )
+    
+    def _parse_results(self, results, timestamp: float) -> DetectionResult:
+        """
+        Convert YOLO results for one frame into a DetectionResult.
+        
+        Args:
+            results: Iterable of YOLO result objects for the frame
+            timestamp: Frame timestamp
             
-            # Return empty result on failure to allow graceful degradation
-            return DetectionResult(
-                vehicles=[],
-                pedestrians=[],
-                emergency_vehicles=[],
-                timestamp=timestamp
+        Returns:
+            DetectionResult with vehicles, pedestrians, and emergency vehicles
+        """
+        bbox_parts = []
+        confidence_parts = []
+        class_id_parts = []
+        class_names = []
+        
+        for result in results:
+            boxes = result.boxes
+            
+            # Transfer each tensor to host once instead of once per detection
+            # (FP16 inference returns half tensors; widen them back to float32)
+            xyxy = boxes.xyxy.cpu().numpy().astype(np.float32, copy=False)  # [x1, y1, x2, y2] rows
+            confidences = boxes.conf.cpu().numpy().astype(np.float32, copy=False)
+            class_ids = boxes.cls.cpu().numpy().astype(np.int32)
+            
+            # Filter by confidence threshold
+            keep = confidences >= self.confidence_threshold
+            xyxy, confidences, class_ids = xyxy[keep], confidences[keep], class_ids[keep]
+            
+            # Convert to [x, y, width, height] format
+            xy = xyxy[:, :2].astype(np.int64)
+            wh = (xyxy[:, 2:] - xyxy[:, :2]).astype(np.int64)
+            
+            bbox_parts.append(np.hstack([xy, wh]))
+            confidence_parts.append(confidences)
+            class_id_parts.append(class_ids)
+            class_names.extend(result.names[class_id] for class_id in class_ids.tolist())
+        
+        if bbox_parts:
+            bboxes = np.concatenate(bbox_parts)
+            batch = DetectionBatch(
+                bboxes=bboxes,
+                centers=bboxes[:, :2] + bboxes[:, 2:] // 2,
+                confidences=np.concatenate(confidence_parts),
+                class_ids=np.concatenate(class_id_parts),
+                class_names=class_names
+            )
+        else:
+            batch = DetectionBatch(
+                bboxes=np.empty((0, 4), dtype=np.int64),
+                centers=np.empty((0, 2), dtype=np.int64),
+                confidences=np.empty(0, dtype=np.float32),
+                class_ids=np.empty(0, dtype=np.int32),
+                class_names=[]
             )
+        
+        # Classify the whole frame at once; emergency vehicles are a subset of vehicles
+        class_ids = batch.class_ids
+        areas = batch.bboxes[:, 2] * batch.bboxes[:, 3]
+        pedestrian_mask = np.isin(class_ids, self._pedestrian_ids)
+        vehicle_mask = np.isin(class_ids, self._vehicle_ids)
+        emerg_mask = vehicle_mask & (
+            np.isin(class_ids, self._emerg_ids)
+            | (np.isin(class_ids, self._large_vehicle_ids) & (areas > self.EMERGENCY_MIN_AREA))
+        )
+        
+        pedestrians = [batch.view(i) for i in np.flatnonzero(pedestrian_mask).tolist()]
+        vehicles = []
+        emergency_vehicles = []
+        for i, is_emergency in zip(np.flatnonzero(vehicle_mask).tolist(), emerg_mask[vehicle_mask].tolist()):
+            detection = batch.view(i)
+            detection._is_emergency = is_emergency
+            vehicles.append(detection)
+            if is_emergency:
+                emergency_vehicles.append(detection)
+        
+        return DetectionResult(
+            vehicles=vehicles,
+            pedestrians=pedestrians,
+            emergency_vehicles=emergency_vehicles,
+            timestamp=timestamp,
+            batch=batch
+        )
     
     def classify_vehicle_type(self, detection: Detection) -> VehicleType:
         """
@@ -443,24 +1015,13 @@ class EnhancedDetector:
         Returns:
             VehicleType classification
         """
-        class_name = detection.class_name.lower()
-        
         # Check if emergency vehicle first
         if self.is_emergency_vehicle(detection):
             # For now, default to ambulance
             # In a real system, we'd use more sophisticated classification
             return VehicleType.EMERGENCY_AMBULANCE
         
-        # Map YOLO class to VehicleType
-        type_mapping = {
-            'car': VehicleType.CAR,
-            'truck': VehicleType.TRUCK,
-            'bus': VehicleType.BUS,
-            'motorcycle': VehicleType.MOTORCYCLE,
-            'bicycle': VehicleType.BICYCLE
-        }
-        
-        return type_mapping.get(class_name, VehicleType.CAR)
+        return self.TYPE_MAPPING.get(detection.class_name.lower(), VehicleType.CAR)
     
     def is_emergency_vehicle(self, detection: Detection) -> bool:
         """
@@ -480,6 +1041,13 @@ class EnhancedDetector:
         Returns:
             True if emergency vehicle, False otherwise
         """
+        # Reuse the answer when the detection was already checked (e.g. by classify_vehicle_type)
+        if detection._is_emergency is None:
+            detection._is_emergency = self._check_emergency(detection)
+        return detection._is_emergency
+    
+    def _check_emergency(self, detection: Detection) -> bool:
+        """Uncached emergency check used by is_emergency_vehicle."""
         # For now, use a simple heuristic based on vehicle size and type
         # Large vehicles (trucks, buses) have a small chance of being emergency vehicles
         # This is a placeholder for more sophisticated detection
@@ -487,9 +1055,8 @@ class EnhancedDetector:
         class_name = detection.class_name.lower()
         
         # Check class name for emergency keywords
-        for keyword in self.EMERGENCY_KEYWORDS:
-            if keyword in class_name:
-                return True
+        if class_name in self.EMERGENCY_NAMES or self._has_emergency_keyword(class_name):
+            return True
         
         # In a real system, we would analyze:
         # 1. Vehicle color (red, white, yellow)
@@ -503,14 +1070,22 @@ class EnhancedDetector:
         area = w * h
         
         # Trucks and buses could be emergency vehicles
-        if class_name in ['truck', 'bus']:
+        if class_name in self.LARGE_VEHICLE_NAMES:
             # Use a probabilistic approach based on size
             # Larger vehicles have higher chance
             # This is a placeholder - real detection would be deterministic
-            return area > 50000  # Arbitrary threshold for demo
+            return area > self.EMERGENCY_MIN_AREA
         
         return False
     
+    def _has_emergency_keyword(self, class_name: str) -> bool:
+        """Check a class name for emergency keywords, memoised per name."""
+        matched = self._emergency_name_cache.get(class_name)
+        if matched is None:
+            matched = any(keyword in class_name for keyword in self.EMERGENCY_KEYWORDS)
+            self._emergency_name_cache[class_name] = matched
+        return matched
+    
     def track_objects(self, detections: List[Detection], fps: float = 30.0) -> List[TrackedObject]:
         """
         Track objects across frames.
@@ -8,16 +8,106 @@ Extends TrafficAnalyzer with:
 - Throughput metrics calculation
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Final, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import time
-from collections import deque
+from bisect import bisect_left, insort
+from collections import defaultdict
+from types import MappingProxyType
+import numpy as np
 
 from src.traffic_analyzer import TrafficAnalyzer
 from src.queue_estimator import QueueMetrics
 from src.enhanced_detector import VehicleType
 
+# Numba is optional; without it the trend helper runs as plain Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Weighted priority formula factors, shared by the scalar and batch paths
+# (module-level so the compiled batch kernel can fold them in as literals)
+QUEUE_PRIORITY_SCALE: Final = 0.2  # Roughly 5 meters per vehicle
+WAIT_PRIORITY_SCALE: Final = 0.1  # 10 seconds = 1 priority point
+EMERGENCY_PRIORITY_MULTIPLIER: Final = 10.0
+PEDESTRIAN_BOOST_STEP: Final = 0.1  # 10% per waiting pedestrian
+PEDESTRIAN_BOOST_CAP: Final = 10  # Pedestrian count where the boost saturates
+
+
+def _ring_window_sums(ring: np.ndarray, total: int) -> Tuple[float, float]:
+    """
+    Sum the older and recent halves of a density ring from scratch.
+    
+    Used to resynchronize the running sums kept by detect_congestion_trend,
+    so floating-point drift cannot accumulate.
+    
+    Args:
+        ring: Fixed-size ring buffer of densities; sample k lives at k % len(ring)
+        total: Number of samples ever written to the ring
+    
+    Returns:
+        Tuple of (older_sum, recent_sum) over the retained samples, split at n // 2
+    """
+    size = ring.shape[0]
+    n = min(total, size)
+    start = total - n
+    mid_point = n // 2
+    
+    older_sum = 0.0
+    for k in range(start, start + mid_point):
+        older_sum += ring[k % size]
+    recent_sum = 0.0
+    for k in range(start + mid_point, total):
+        recent_sum += ring[k % size]
+    return older_sum, recent_sum
+
+
+def _weighted_priority_batch(counts: np.ndarray, queues: np.ndarray, waits: np.ndarray,
+                             type_counts: np.ndarray, type_weights: np.ndarray,
+                             has_emergency: np.ndarray, pedestrian_counts: np.ndarray,
+                             out: np.ndarray) -> None:
+    """
+    Score many lanes with the calculate_weighted_priority formula.
+    
+    Writes one priority per lane into out, computing each term the same way
+    as the scalar method.
+    """
+    for i in range(counts.shape[0]):
+        total_vehicles = 0.0
+        type_priority = 0.0
+        for j in range(type_counts.shape[1]):
+            total_vehicles += type_counts[i, j]
+            type_priority += type_counts[i, j] * type_weights[j]
+        if total_vehicles > 0:
+            type_priority = type_priority / total_vehicles
+        else:
+            type_priority = 1.0
+        
+        emergency_multiplier = EMERGENCY_PRIORITY_MULTIPLIER if has_emergency[i] else 1.0
+        pedestrian_boost = 1.0 + PEDESTRIAN_BOOST_STEP * min(pedestrian_counts[i], PEDESTRIAN_BOOST_CAP)
+        
+        base_priority = counts[i] + queues[i] * QUEUE_PRIORITY_SCALE + waits[i] * WAIT_PRIORITY_SCALE
+        out[i] = base_priority * type_priority * emergency_multiplier * pedestrian_boost
+
+
+if NUMBA_AVAILABLE:
+    _ring_window_sums = njit(cache=True, fastmath=True)(_ring_window_sums)
+    # Serial on purpose: a parallel (prange) build measured slower even at
+    # thousands of lanes, as thread launch costs more than the per-lane work
+    _weighted_priority_batch = njit(cache=True)(_weighted_priority_batch)
+_jit_warmed_up = False
+
+# Pedestrian priority boost by waiting pedestrian count: 10% per pedestrian, saturating at 10
+_PED_BOOST: Final = tuple(
+    1.0 + PEDESTRIAN_BOOST_STEP * count for count in range(PEDESTRIAN_BOOST_CAP + 1)
+)
+
+# Emergency multiplier indexed by LaneData.has_emergency (False -> 1.0, True -> 10.0)
+_EMERGENCY_MULTIPLIER: Final = (1.0, EMERGENCY_PRIORITY_MULTIPLIER)
+
 
 class CongestionTrend(Enum):
     """Congestion trend classifications"""
@@ -29,6 +119,8 @@ class CongestionTrend(Enum):
 @dataclass
 class DensitySnapshot:
     """Snapshot of density at a point in time"""
+    __slots__ = ('timestamp', 'lane', 'density', 'vehicle_count', 'queue_length')
+    
     timestamp: float
     lane: str
     density: float
@@ -36,9 +128,35 @@ class DensitySnapshot:
     queue_length: float
 
 
+@dataclass
+class DensityWindow:
+    """
+    Recent densities for one lane, stored as a fixed-size ring buffer.
+    
+    Only densities are kept, since they are all the trend math reads; the
+    running sums cover the older and recent halves of the retained samples.
+    """
+    ring: np.ndarray  # sample k lives at k % len(ring)
+    total: int = 0  # samples written since the last clear
+    older_sum: float = 0.0
+    recent_sum: float = 0.0
+    
+    def __len__(self) -> int:
+        return min(self.total, self.ring.shape[0])
+    
+    def clear(self) -> None:
+        """Drop all retained samples."""
+        self.total = 0
+        self.older_sum = 0.0
+        self.recent_sum = 0.0
+
+
 @dataclass
 class LaneData:
     """Comprehensive lane data for priority calculation"""
+    __slots__ = ('vehicle_count', 'queue_length', 'wait_time', 'vehicle_types',
+                 'has_emergency', 'pedestrian_count')
+    
     vehicle_count: int
     queue_length: float  # in meters
     wait_time: float  # average wait time in seconds
@@ -58,7 +176,8 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
     
     # Vehicle type priority weights
     # Higher weight = higher priority in signal allocation
-    VEHICLE_TYPE_WEIGHTS = {
+    # (read-only; the analyzer builds its lookup tables from it once)
+    VEHICLE_TYPE_WEIGHTS = MappingProxyType({
         VehicleType.CAR: 1.0,
         VehicleType.MOTORCYCLE: 0.8,
         VehicleType.BICYCLE: 0.7,
@@ -67,7 +186,7 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         VehicleType.EMERGENCY_AMBULANCE: 10.0,
         VehicleType.EMERGENCY_FIRE: 10.0,
         VehicleType.EMERGENCY_POLICE: 10.0,
-    }
+    })
     
     # Queue length weight factor
     # How much queue length contributes to density calculation
@@ -85,12 +204,65 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         """Initialize enhanced traffic analyzer."""
         super().__init__()
         
-        # Historical data for trend detection
-        self.density_history: Dict[str, deque] = {}
+        # VEHICLE_TYPE_WEIGHTS keyed by member value. Lookups read the member's
+        # _value_ attribute (plain, unlike the .value property) and hash
+        # a str instead of calling Enum.__hash__. Type name strings such as
+        # main.py's keys map to the same weights; anything else gets 1.0
+        self._type_weights: Dict[str, float] = {
+            vehicle_type.value: weight for vehicle_type, weight in self.VEHICLE_TYPE_WEIGHTS.items()
+        }
+        
+        # The same weights as a vector, one column per VehicleType member in definition order
+        self._type_weight_vector = np.array(
+            [self.VEHICLE_TYPE_WEIGHTS.get(vehicle_type, 1.0) for vehicle_type in VehicleType]
+        )
+        
+        # Historical densities for trend detection
+        # (lanes get their window on first access)
+        self.density_history: Dict[str, DensityWindow] = defaultdict(
+            lambda: DensityWindow(ring=np.zeros(self.TREND_WINDOW_SIZE))
+        )
         
         # Throughput tracking
-        self.throughput_data: Dict[str, List[float]] = {}  # lane -> list of timestamps
+        self.throughput_data: Dict[str, List[float]] = defaultdict(list)  # lane -> sorted timestamps, oldest first
+        
+        # Time of the current tick, shared by every lane processed in it (see tick())
+        self._now: Optional[float] = None
+        
+        self._warm_up_jit()
+    
+    @staticmethod
+    def _warm_up_jit() -> None:
+        """Compile the Numba trend helper once per process, off the first tick's path."""
+        global _jit_warmed_up
+        if NUMBA_AVAILABLE and not _jit_warmed_up:
+            _ring_window_sums(np.ones(3), 3)
+            ones = np.ones(1)
+            _weighted_priority_batch(ones, ones, ones, np.ones((1, len(VehicleType))), ones,
+                                     np.zeros(1, dtype=np.bool_), np.zeros(1, dtype=np.int64), np.empty(1))
+            _jit_warmed_up = True
+    
+    def tick(self, now: Optional[float] = None) -> float:
+        """
+        Start a new processing tick (e.g. a frame).
         
+        Reads the clock once; until the next tick, throughput calculations and
+        clearances recorded without an explicit timestamp use this time instead
+        of reading the clock per lane.
+        
+        Args:
+            now: Time of the tick (defaults to current time)
+        
+        Returns:
+            The tick time
+        """
+        self._now = time.time() if now is None else now
+        return self._now
+    
+    def _current_time(self) -> float:
+        """Get the current tick's time, or read the clock when no tick was started."""
+        return time.time() if self._now is None else self._now
+    
     def calculate_density(self, lane_counts: Dict[str, int], 
                          queue_metrics: Optional[Dict[str, QueueMetrics]] = None) -> Dict[str, float]:
         """
@@ -111,29 +283,26 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         base_densities = super().calculate_density(lane_counts)
         
         # If no queue metrics provided, return base densities
-        if queue_metrics is None:
+        if not queue_metrics:
             return base_densities
         
-        # Enhance densities with queue length information
-        enhanced_densities = {}
-        
-        for lane, base_density in base_densities.items():
-            if lane in queue_metrics:
-                queue_metric = queue_metrics[lane]
-                
-                # Normalize queue length to a comparable scale
-                # Longer queues indicate higher congestion
-                queue_contribution = queue_metric.length_meters * self.QUEUE_WEIGHT_FACTOR
-                
-                # Combined density = base density + weighted queue contribution
-                enhanced_density = base_density + queue_contribution
-                
-                enhanced_densities[lane] = enhanced_density
-            else:
-                # No queue data for this lane, use base density
-                enhanced_densities[lane] = base_density
+        # Only lanes with queue data change; the rest keep their base density
+        lanes = [lane for lane in queue_metrics if lane in base_densities]
+        if not lanes:
+            return base_densities
         
-        return enhanced_densities
+        # Enhance densities with queue length information, all lanes at once
+        base = np.fromiter((base_densities[lane] for lane in lanes), dtype=np.float64, count=len(lanes))
+        queue_lengths = np.fromiter((queue_metrics[lane].length_meters for lane in lanes),
+                                    dtype=np.float64, count=len(lanes))
+        
+        # Combined density = base density + weighted queue contribution
+        # Longer queues indicate higher congestion
+        enhanced = base + queue_lengths * self.QUEUE_WEIGHT_FACTOR
+        
+        # The base dict is fresh per call, so update it in place instead of copying
+        base_densities.update(zip(lanes, enhanced.tolist()))
+        return base_densities
     
     def calculate_weighted_priority(self, lane_data: LaneData) -> float:
         """
@@ -157,31 +326,38 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         
         # Queue length contribution (longer queues need more time)
         # Normalize to similar scale as vehicle count
-        queue_priority = lane_data.queue_length * 0.2  # Roughly 5 meters per vehicle
+        queue_priority = lane_data.queue_length * QUEUE_PRIORITY_SCALE
         
         # Wait time contribution (fairness factor)
         # Lanes that have waited longer get priority boost
-        wait_priority = lane_data.wait_time * 0.1  # 10 seconds = 1 priority point
+        wait_priority = lane_data.wait_time * WAIT_PRIORITY_SCALE
         
         # Vehicle type weighting
         type_priority = 0.0
-        total_vehicles = sum(lane_data.vehicle_types.values())
+        weights = self._type_weights
+        vehicle_types = lane_data.vehicle_types
+        total_vehicles = sum(vehicle_types.values())
         
-        if total_vehicles > 0:
-            for vehicle_type, count in lane_data.vehicle_types.items():
-                weight = self.VEHICLE_TYPE_WEIGHTS.get(vehicle_type, 1.0)
-                type_priority += count * weight
+        if total_vehicles <= 0:
+            type_priority = 1.0  # Default weight
+        elif len(vehicle_types) == 1:
+            # Single type (usually all cars): the weighted average is its weight
+            for vehicle_type in vehicle_types:
+                type_priority = weights.get(getattr(vehicle_type, '_value_', vehicle_type), 1.0)
+        else:
+            for vehicle_type, count in vehicle_types.items():
+                if count:
+                    type_priority += count * weights.get(getattr(vehicle_type, '_value_', vehicle_type), 1.0)
             
             # Normalize by total vehicles to get weighted average
             type_priority = type_priority / total_vehicles
-        else:
-            type_priority = 1.0  # Default weight
         
         # Emergency vehicle override
-        emergency_multiplier = 10.0 if lane_data.has_emergency else 1.0
+        emergency_multiplier = _EMERGENCY_MULTIPLIER[lane_data.has_emergency]
         
         # Pedestrian consideration (slight boost if pedestrians waiting)
-        pedestrian_boost = 1.0 + (0.1 * min(lane_data.pedestrian_count, 10))
+        pedestrian_count = lane_data.pedestrian_count
+        pedestrian_boost = _PED_BOOST[min(pedestrian_count, PEDESTRIAN_BOOST_CAP)]
         
         # Calculate weighted priority
         # Formula: (count + queue + wait) * type_weight * emergency * pedestrian
@@ -190,6 +366,42 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         
         return weighted_priority
     
+    def calculate_weighted_priority_batch(self, counts: np.ndarray, queues: np.ndarray,
+                                          waits: np.ndarray, type_counts: np.ndarray,
+                                          has_emergency: np.ndarray,
+                                          pedestrian_counts: np.ndarray) -> np.ndarray:
+        """
+        Calculate weighted priorities for many lanes at once.
+        
+        Same formula as calculate_weighted_priority, with lane data passed as
+        arrays (one entry per lane) and scored in a single compiled loop.
+        
+        Args:
+            counts: Vehicle count per lane
+            queues: Queue length per lane in meters
+            waits: Average wait time per lane in seconds
+            type_counts: (n_lanes, len(VehicleType)) vehicle counts, with
+                columns in VehicleType definition order
+            has_emergency: Whether each lane has an emergency vehicle
+            pedestrian_counts: Waiting pedestrians per lane
+        
+        Returns:
+            Array of weighted priority scores, one per lane
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        priorities = np.empty(counts.shape[0])
+        _weighted_priority_batch(
+            counts,
+            np.asarray(queues, dtype=np.float64),
+            np.asarray(waits, dtype=np.float64),
+            np.asarray(type_counts, dtype=np.float64).reshape(counts.shape[0], len(VehicleType)),
+            self._type_weight_vector,
+            np.asarray(has_emergency, dtype=np.bool_),
+            np.asarray(pedestrian_counts, dtype=np.int64),
+            priorities
+        )
+        return priorities
+    
     def detect_congestion_trend(self, lane: str, current_density: float, 
                                current_count: int, current_queue: float) -> CongestionTrend:
         """
@@ -202,38 +414,53 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         Args:
             lane: Lane identifier
             current_density: Current density value
-            current_count: Current vehicle count
-            current_queue: Current queue length in meters
+            current_count: Current vehicle count (not used by the trend math)
+            current_queue: Current queue length in meters (not used by the trend math)
             
         Returns:
             CongestionTrend indicating traffic pattern
         """
-        # Initialize history for this lane if needed
-        if lane not in self.density_history:
-            self.density_history[lane] = deque(maxlen=self.TREND_WINDOW_SIZE)
-        
-        # Add current snapshot
-        snapshot = DensitySnapshot(
-            timestamp=time.time(),
-            lane=lane,
-            density=current_density,
-            vehicle_count=current_count,
-            queue_length=current_queue
-        )
-        self.density_history[lane].append(snapshot)
+        window = self.density_history[lane]
+        ring = window.ring
+        size = ring.shape[0]
+        total = window.total
+        n = min(total, size)
+        
+        # Slide the window in O(1): when full, the oldest sample leaves the
+        # older half; the sample at the split point moves from recent to older
+        # whenever the older half grows or shifts
+        older_sum = window.older_sum
+        recent_sum = window.recent_sum
+        start = total - n
+        if n == size:
+            older_sum -= ring.item(start % size)
+            start += 1
+        new_n = min(n + 1, size)
+        if n == size or new_n // 2 > n // 2:
+            moved = ring.item((start + new_n // 2 - 1) % size)
+            older_sum += moved
+            recent_sum -= moved
+        ring[total % size] = current_density
+        recent_sum += current_density
+        total += 1
+        
+        # Resync from the ring once per lap so rounding errors stay bounded, and
+        # whenever the older half is (near) zero, where a leftover rounding
+        # error would otherwise read as a huge relative change
+        if total % size == 0 or abs(older_sum) < 1e-6:
+            older_sum, recent_sum = _ring_window_sums(ring, total)
+        window.total = total
+        window.older_sum = older_sum
+        window.recent_sum = recent_sum
         
         # Need at least 3 snapshots to detect trend
-        if len(self.density_history[lane]) < 3:
+        if new_n < 3:
             return CongestionTrend.STABLE
         
-        # Calculate trend using linear regression on density values
-        snapshots = list(self.density_history[lane])
-        n = len(snapshots)
-        
         # Simple trend calculation: compare recent average to older average
-        mid_point = n // 2
-        older_avg = sum(s.density for s in snapshots[:mid_point]) / mid_point
-        recent_avg = sum(s.density for s in snapshots[mid_point:]) / (n - mid_point)
+        mid_point = new_n // 2
+        older_avg = older_sum / mid_point
+        recent_avg = recent_sum / (new_n - mid_point)
         
         # Avoid division by zero
         if older_avg == 0:
@@ -267,28 +494,34 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         if time_window is None:
             time_window = self.THROUGHPUT_WINDOW_SECONDS
         
-        # Initialize throughput data for this lane if needed
-        if lane not in self.throughput_data:
-            self.throughput_data[lane] = []
+        return self._throughput_at(lane, self._current_time(), time_window)
+    
+    def _throughput_at(self, lane: str, now: float, time_window: float) -> float:
+        """
+        Calculate throughput for a tracked lane as of a given time.
         
-        current_time = time.time()
+        Lets callers covering several lanes read the clock once.
         
-        # Remove old timestamps outside the window
-        cutoff_time = current_time - time_window
-        self.throughput_data[lane] = [
-            ts for ts in self.throughput_data[lane] if ts >= cutoff_time
-        ]
+        Args:
+            lane: Lane identifier
+            now: Current time
+            time_window: Time window in seconds
         
-        # Calculate throughput
-        vehicle_count = len(self.throughput_data[lane])
+        Returns:
+            Throughput in vehicles per hour
+        """
+        # Remove old timestamps outside the window; timestamps are kept sorted,
+        # so expired ones are a prefix, located by binary search and dropped
+        # in one slice deletion
+        timestamps = self.throughput_data[lane]
+        expired = bisect_left(timestamps, now - time_window)
+        if expired:
+            del timestamps[:expired]
         
         # Convert to vehicles per hour
         if time_window > 0:
-            throughput = (vehicle_count / time_window) * 3600.0
-        else:
-            throughput = 0.0
-        
-        return throughput
+            return (len(timestamps) / time_window) * 3600.0
+        return 0.0
     
     def record_vehicle_cleared(self, lane: str, timestamp: Optional[float] = None) -> None:
         """
@@ -299,17 +532,54 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         
         Args:
             lane: Lane identifier
-            timestamp: Timestamp of clearance (defaults to current time)
+            timestamp: Timestamp of clearance (defaults to the current tick's time,
+                or current time when no tick was started)
         """
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = self._current_time()
+        
+        # Record the clearance, keeping timestamps sorted (late reports are rare)
+        timestamps = self.throughput_data[lane]
+        if not timestamps or timestamp >= timestamps[-1]:
+            timestamps.append(timestamp)
+        else:
+            insort(timestamps, timestamp)
+    
+    def update_lane(self, lane: str, density: float, count: int, queue: float,
+                    cleared: int = 0, time_window: float = None) -> Tuple[CongestionTrend, float]:
+        """
+        Update a lane's trend and throughput in one call.
+        
+        Equivalent to detect_congestion_trend, then record_vehicle_cleared once
+        per cleared vehicle, then calculate_throughput, but with a single clock
+        read and the lane's timestamp list looked up once.
+        
+        Args:
+            lane: Lane identifier
+            density: Current density value
+            count: Current vehicle count
+            queue: Current queue length in meters
+            cleared: Vehicles that cleared the intersection since the last update
+            time_window: Throughput time window in seconds (default: 1 hour)
+        
+        Returns:
+            Tuple of (congestion trend, throughput in vehicles per hour)
+        """
+        if time_window is None:
+            time_window = self.THROUGHPUT_WINDOW_SECONDS
+        now = self._current_time()
+        
+        trend = self.detect_congestion_trend(lane, density, count, queue)
         
-        # Initialize throughput data for this lane if needed
-        if lane not in self.throughput_data:
-            self.throughput_data[lane] = []
+        if cleared > 0:
+            timestamps = self.throughput_data[lane]
+            if not timestamps or now >= timestamps[-1]:
+                timestamps.extend([now] * cleared)
+            else:
+                for _ in range(cleared):
+                    insort(timestamps, now)
         
-        # Record the clearance
-        self.throughput_data[lane].append(timestamp)
+        return trend, self._throughput_at(lane, now, time_window)
     
     def get_throughput_summary(self, time_window: float = None) -> Dict[str, float]:
         """
@@ -321,12 +591,12 @@ class EnhancedTrafficAnalyzer(TrafficAnalyzer):
         Returns:
             Dictionary mapping lane names to throughput values (vehicles/hour)
         """
-        summary = {}
-        
-        for lane in self.throughput_data.keys():
-            summary[lane] = self.calculate_throughput(lane, time_window)
+        if time_window is None:
+            time_window = self.THROUGHPUT_WINDOW_SECONDS
         
-        return summary
+        # One clock read for the whole summary
+        now = self._current_time()
+        return {lane: self._throughput_at(lane, now, time_window) for lane in self.throughput_data}
     
     def reset_history(self, lane: Optional[str] = None) -> None:
         """
@@ -5,9 +5,12 @@ Provides advanced visualization features including heatmaps, trajectories, queue
 enhanced signal panels, metrics overlays, and multi-camera layouts.
 """
 
+import math
 import cv2
 import numpy as np
-from typing import List, Dict, Optional, Any, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass
 
 # Import from existing modules
@@ -51,6 +54,49 @@ except ImportError:
         is_spillback: bool
 
 
+@lru_cache(maxsize=2048)
+def _text_size(text: str, font_scale: float, thickness: int) -> Tuple[int, int]:
+    """
+    Measure text drawn in FONT_HERSHEY_SIMPLEX, memoized.
+    
+    Labels repeat heavily from frame to frame (confidences are shown at two
+    decimals, lane and state names are fixed), so most calls are cache hits.
+    
+    Args:
+        text: Text to measure
+        font_scale: Font scale factor
+        thickness: Stroke thickness
+    
+    Returns:
+        Tuple of (width, height) in pixels, excluding the baseline
+    """
+    (width, height), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+    return width, height
+
+
+@lru_cache(maxsize=4)
+def _lane_regions(width: int, height: int) -> Mapping[str, Tuple[int, int, int, int]]:
+    """
+    Lane regions for a frame size (simplified quadrant mapping), memoized.
+    
+    Args:
+        width: Frame width
+        height: Frame height
+    
+    Returns:
+        Read-only mapping of lane name to (x, y, width, height)
+    """
+    half_w = width // 2
+    half_h = height // 2
+    
+    return MappingProxyType({
+        'north': (0, 0, half_w, half_h),
+        'south': (half_w, half_h, half_w, half_h),
+        'east': (half_w, 0, half_w, half_h),
+        'west': (0, half_h, half_w, half_h)
+    })
+
+
 class EnhancedVisualizer(Visualizer):
     """
     Enhanced visualizer with advanced features for SMART FLOW v2.
@@ -72,9 +118,13 @@ class EnhancedVisualizer(Visualizer):
         'critical': (0, 0, 255)   # Red - critical congestion
     }
     
+    # Lanes covered by the heatmap, in lane index map order (index 0 = no lane)
+    HEATMAP_LANES = ('north', 'south', 'east', 'west')
+    
     # Trajectory colors (BGR format)
     TRAJECTORY_COLOR = (255, 128, 0)  # Cyan-blue
     TRAJECTORY_THICKNESS = 2
+    TRAJECTORY_SIMPLIFY_EPSILON = 1.5  # Max deviation (pixels) when simplifying paths before drawing
     
     # Queue visualization colors
     QUEUE_COLOR = (0, 0, 255)  # Red
@@ -97,14 +147,29 @@ class EnhancedVisualizer(Visualizer):
         self.max_display_width = 1280
         self.max_display_height = 720
         
-        # Heatmap accumulator for temporal smoothing
-        self.heatmap_accumulator: Optional[np.ndarray] = None
+        # Heatmap state for temporal smoothing: every pixel of a lane region
+        # shows the same color, so only one smoothed color per lane is kept
+        # (row 0 is the black of pixels outside every lane, see HEATMAP_LANES)
+        self._lane_colors = np.zeros((len(self.HEATMAP_LANES) + 1, 3), dtype=np.float32)
         self.heatmap_alpha = 0.7  # Blending factor for temporal smoothing
+        
+        # Frame rectangles that each lie in one lane region, built once per frame size
+        self._heatmap_tiles: Optional[List[Tuple[int, int, int, int, int]]] = None
+        self._heatmap_tiles_size: Optional[Tuple[int, int]] = None
+        
+        # Cell buffer reused by grid layouts (see _grid_cell_buffer)
+        self._grid_cells: Optional[np.ndarray] = None
+        
+        # Metric overlay text: Title Case display keys, and the last line
+        # drawn per key with the value it was formatted from
+        self._metric_key_cache: Dict[str, str] = {}
+        self._metric_line_cache: Dict[str, Tuple[Any, str]] = {}
     
     def draw_detections_enhanced(
         self,
         frame: Frame,
-        result: DetectionResult
+        result: DetectionResult,
+        inplace: bool = False
     ) -> Frame:
         """
         Draw enhanced detection visualization with vehicle types and emergency indicators.
@@ -112,11 +177,12 @@ class EnhancedVisualizer(Visualizer):
         Args:
             frame: Frame object containing the image
             result: DetectionResult with vehicles, pedestrians, and emergency vehicles
+            inplace: Draw on frame.image itself and return frame, instead of a copy
             
         Returns:
             Frame with enhanced detection visualization
         """
-        annotated_image = frame.image.copy()
+        annotated_image = frame.image if inplace else frame.image.copy()
         
         # Draw regular vehicles in blue
         for detection in result.vehicles:
@@ -130,6 +196,13 @@ class EnhancedVisualizer(Visualizer):
         for detection in result.emergency_vehicles:
             self._draw_detection_box(annotated_image, detection, (0, 0, 255), "EMERGENCY", bold=True)
         
+        return self._annotated_frame(frame, annotated_image, inplace)
+    
+    @staticmethod
+    def _annotated_frame(frame: Frame, annotated_image: np.ndarray, inplace: bool) -> Frame:
+        """Return frame itself after in-place drawing, else a new Frame holding annotated_image."""
+        if inplace:
+            return frame
         return Frame(
             image=annotated_image,
             frame_number=frame.frame_number,
@@ -156,7 +229,7 @@ class EnhancedVisualizer(Visualizer):
         font_scale = 0.6 if bold else 0.5
         font_thickness = 2 if bold else 1
         
-        label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, font_thickness)
+        label_size = _text_size(label, font_scale, font_thickness)
         
         # Draw label background
         cv2.rectangle(
@@ -181,7 +254,8 @@ class EnhancedVisualizer(Visualizer):
     def draw_heatmap(
         self,
         frame: Frame,
-        density_data: Dict[str, float]
+        density_data: Dict[str, float],
+        inplace: bool = False
     ) -> Frame:
         """
         Draw traffic density heatmap overlay on the frame.
@@ -189,6 +263,7 @@ class EnhancedVisualizer(Visualizer):
         Args:
             frame: Frame object containing the image
             density_data: Dictionary mapping lane names to density values (0.0 to 1.0)
+            inplace: Draw on frame.image itself and return frame, instead of a copy
             
         Returns:
             Frame with heatmap overlay
@@ -196,41 +271,99 @@ class EnhancedVisualizer(Visualizer):
         if not self.enable_heatmap:
             return frame
         
-        annotated_image = frame.image.copy()
-        height, width = annotated_image.shape[:2]
+        height, width = frame.image.shape[:2]
         
-        # Initialize heatmap accumulator if needed
-        if self.heatmap_accumulator is None:
-            self.heatmap_accumulator = np.zeros((height, width, 3), dtype=np.float32)
+        if self._heatmap_tiles_size != (height, width):
+            self._heatmap_tiles = self._build_heatmap_tiles(width, height)
+            self._heatmap_tiles_size = (height, width)
+        
+        # Map density to a color per lane; pixels outside the known lanes stay black
+        current_colors = np.zeros_like(self._lane_colors)
+        for lane_name, density in density_data.items():
+            lane_key = lane_name.lower()
+            if lane_key in self.HEATMAP_LANES:
+                current_colors[self.HEATMAP_LANES.index(lane_key) + 1] = self._get_heatmap_color(density)
+        
+        # Temporal smoothing
+        self._lane_colors = (
+            self.heatmap_alpha * current_colors +
+            (1 - self.heatmap_alpha) * self._lane_colors
+        )
+        heatmap_colors = self._lane_colors.astype(np.uint8)
+        
+        # Blend with original image: per lane, 0.7 * pixel + 0.3 * lane color is
+        # an affine map, applied to each tile in one cv2.transform pass without
+        # ever materializing the heatmap image
+        blend_maps = np.zeros((len(heatmap_colors), 3, 4))
+        blend_maps[:, [0, 1, 2], [0, 1, 2]] = 0.7
+        blend_maps[:, :, 3] = 0.3 * heatmap_colors
+        
+        blended = frame.image if inplace else np.empty_like(frame.image)
+        for y0, y1, x0, x1, lane_index in self._heatmap_tiles:
+            tile = blended[y0:y1, x0:x1]
+            result = cv2.transform(frame.image[y0:y1, x0:x1], blend_maps[lane_index], dst=tile)
+            if result is not tile:
+                tile[...] = result
+        
+        return self._annotated_frame(frame, blended, inplace)
+    
+    def _build_lane_index_map(self, width: int, height: int) -> np.ndarray:
+        """
+        Build the per-pixel lane index of the heatmap lane regions.
         
-        # Create current heatmap
-        current_heatmap = np.zeros((height, width, 3), dtype=np.float32)
+        Args:
+            width: Frame width
+            height: Frame height
+        
+        Returns:
+            (height, width) uint8 array holding 1 + the lane's position in
+            HEATMAP_LANES, or 0 for pixels outside every lane region
+        """
+        lane_index_map = np.zeros((height, width), dtype=np.uint8)
         
-        # Map density to colors for each region
         # For simplicity, divide frame into quadrants for each lane
-        for lane_name, density in density_data.items():
-            color = self._get_heatmap_color(density)
+        for index, lane_name in enumerate(self.HEATMAP_LANES, start=1):
             region = self._get_lane_region(lane_name, width, height)
             
             if region:
                 x, y, w, h = region
-                current_heatmap[y:y+h, x:x+w] = color
+                lane_index_map[y:y+h, x:x+w] = index
         
-        # Temporal smoothing
-        self.heatmap_accumulator = (
-            self.heatmap_alpha * current_heatmap +
-            (1 - self.heatmap_alpha) * self.heatmap_accumulator
-        )
+        return lane_index_map
+    
+    def _build_heatmap_tiles(self, width: int, height: int) -> List[Tuple[int, int, int, int, int]]:
+        """
+        Split the frame into rectangles that each lie within a single lane region.
         
-        # Convert to uint8 and blend with original image
-        heatmap_uint8 = self.heatmap_accumulator.astype(np.uint8)
-        blended = cv2.addWeighted(annotated_image, 0.7, heatmap_uint8, 0.3, 0)
+        The lane region edges cut the frame into a grid; each grid cell is
+        covered by one lane (or none), so it can be blended with one color.
         
-        return Frame(
-            image=blended,
-            frame_number=frame.frame_number,
-            timestamp=frame.timestamp
-        )
+        Args:
+            width: Frame width
+            height: Frame height
+        
+        Returns:
+            List of (y0, y1, x0, x1, lane index) tiles covering the frame
+        """
+        lane_index_map = self._build_lane_index_map(width, height)
+        
+        xs = {0, width}
+        ys = {0, height}
+        for lane_name in self.HEATMAP_LANES:
+            region = self._get_lane_region(lane_name, width, height)
+            
+            if region:
+                x, y, w, h = region
+                xs.update(min(max(edge, 0), width) for edge in (x, x + w))
+                ys.update(min(max(edge, 0), height) for edge in (y, y + h))
+        xs = sorted(xs)
+        ys = sorted(ys)
+        
+        return [
+            (y0, y1, x0, x1, int(lane_index_map[y0, x0]))
+            for y0, y1 in zip(ys, ys[1:])
+            for x0, x1 in zip(xs, xs[1:])
+        ]
     
     def _get_heatmap_color(self, density: float) -> Tuple[float, float, float]:
         """
@@ -268,22 +401,13 @@ class EnhancedVisualizer(Visualizer):
         Returns:
             Tuple of (x, y, width, height) or None
         """
-        half_w = width // 2
-        half_h = height // 2
-        
-        regions = {
-            'north': (0, 0, half_w, half_h),
-            'south': (half_w, half_h, half_w, half_h),
-            'east': (half_w, 0, half_w, half_h),
-            'west': (0, half_h, half_w, half_h)
-        }
-        
-        return regions.get(lane_name.lower())
+        return _lane_regions(width, height).get(lane_name.lower())
     
     def draw_trajectories(
         self,
         frame: Frame,
-        tracked_objects: List[TrackedObject]
+        tracked_objects: List[TrackedObject],
+        inplace: bool = False
     ) -> Frame:
         """
         Draw vehicle trajectories showing their paths through the intersection.
@@ -291,6 +415,7 @@ class EnhancedVisualizer(Visualizer):
         Args:
             frame: Frame object containing the image
             tracked_objects: List of TrackedObject instances with trajectory data
+            inplace: Draw on frame.image itself and return frame, instead of a copy
             
         Returns:
             Frame with trajectory visualization
@@ -298,58 +423,67 @@ class EnhancedVisualizer(Visualizer):
         if not self.enable_trajectories:
             return frame
         
-        annotated_image = frame.image.copy()
+        annotated_image = frame.image if inplace else frame.image.copy()
+        
+        # Only objects with at least two points have a path to draw
+        moving_objects = [obj for obj in tracked_objects if len(obj.trajectory) >= 2]
+        if not moving_objects:
+            return self._annotated_frame(frame, annotated_image, inplace)
+        
+        # Simplify each path (Douglas-Peucker) so near-collinear points do not
+        # cost a segment each, then draw all trajectory lines in one call
+        # (everything here shares one color, so drawing order does not matter)
+        paths = [
+            cv2.approxPolyDP(self._trajectory_points(obj), self.TRAJECTORY_SIMPLIFY_EPSILON, False)
+            for obj in moving_objects
+        ]
+        cv2.polylines(
+            annotated_image,
+            paths,
+            isClosed=False,
+            color=self.TRAJECTORY_COLOR,
+            thickness=self.TRAJECTORY_THICKNESS
+        )
         
-        for obj in tracked_objects:
-            if len(obj.trajectory) < 2:
-                continue
-            
-            # Draw trajectory line
-            points = np.array(obj.trajectory, dtype=np.int32)
-            cv2.polylines(
+        for obj in moving_objects:
+            # Draw direction arrow at the end
+            pt1 = obj.trajectory[-2]
+            pt2 = obj.trajectory[-1]
+            cv2.arrowedLine(
                 annotated_image,
-                [points],
-                isClosed=False,
-                color=self.TRAJECTORY_COLOR,
-                thickness=self.TRAJECTORY_THICKNESS
+                pt1,
+                pt2,
+                self.TRAJECTORY_COLOR,
+                self.TRAJECTORY_THICKNESS,
+                tipLength=0.3
             )
             
-            # Draw direction arrow at the end
-            if len(obj.trajectory) >= 2:
-                pt1 = obj.trajectory[-2]
-                pt2 = obj.trajectory[-1]
-                cv2.arrowedLine(
-                    annotated_image,
-                    pt1,
-                    pt2,
-                    self.TRAJECTORY_COLOR,
-                    self.TRAJECTORY_THICKNESS,
-                    tipLength=0.3
-                )
-            
             # Draw object ID at current position
-            if obj.trajectory:
-                pos = obj.trajectory[-1]
-                cv2.putText(
-                    annotated_image,
-                    f"ID:{obj.object_id}",
-                    (pos[0] + 5, pos[1] - 5),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.4,
-                    self.TRAJECTORY_COLOR,
-                    1
-                )
+            cv2.putText(
+                annotated_image,
+                f"ID:{obj.object_id}",
+                (pt2[0] + 5, pt2[1] - 5),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.4,
+                self.TRAJECTORY_COLOR,
+                1
+            )
         
-        return Frame(
-            image=annotated_image,
-            frame_number=frame.frame_number,
-            timestamp=frame.timestamp
-        )
+        return self._annotated_frame(frame, annotated_image, inplace)
+    
+    @staticmethod
+    def _trajectory_points(obj: TrackedObject) -> np.ndarray:
+        """Get an object's trajectory as an (N, 2) int32 array, reusing the tracker's when present."""
+        points = getattr(obj.trajectory, 'points', None)
+        if points is None or points.dtype != np.int32:
+            points = np.array(obj.trajectory, dtype=np.int32)
+        return points
     
     def draw_queue_visualization(
         self,
         frame: Frame,
-        queue_metrics: Dict[str, QueueMetrics]
+        queue_metrics: Dict[str, QueueMetrics],
+        inplace: bool = False
     ) -> Frame:
         """
         Draw queue visualization showing queue extent and spillback warnings.
@@ -357,11 +491,12 @@ class EnhancedVisualizer(Visualizer):
         Args:
             frame: Frame object containing the image
             queue_metrics: Dictionary mapping lane names to QueueMetrics
+            inplace: Draw on frame.image itself and return frame, instead of a copy
             
         Returns:
             Frame with queue visualization
         """
-        annotated_image = frame.image.copy()
+        annotated_image = frame.image if inplace else frame.image.copy()
         
         for lane_name, metrics in queue_metrics.items():
             if metrics.vehicle_count == 0:
@@ -421,18 +556,15 @@ class EnhancedVisualizer(Visualizer):
                     2
                 )
         
-        return Frame(
-            image=annotated_image,
-            frame_number=frame.frame_number,
-            timestamp=frame.timestamp
-        )
+        return self._annotated_frame(frame, annotated_image, inplace)
     
     def draw_signal_panel(
         self,
         frame: Frame,
         states: Dict[str, SignalState],
         phases: List[SignalPhase],
-        remaining_times: Optional[Dict[str, float]] = None
+        remaining_times: Optional[Dict[str, float]] = None,
+        inplace: bool = False
     ) -> Frame:
         """
         Draw enhanced signal panel with phase information.
@@ -442,29 +574,26 @@ class EnhancedVisualizer(Visualizer):
             states: Dictionary mapping lane names to current signal states
             phases: List of SignalPhase objects in the current cycle
             remaining_times: Optional dictionary of remaining times per lane
+            inplace: Draw on frame.image itself and return frame, instead of a copy
             
         Returns:
             Frame with enhanced signal panel
         """
-        annotated_image = frame.image.copy()
+        annotated_image = frame.image if inplace else frame.image.copy()
         height, width = annotated_image.shape[:2]
         
         if remaining_times is None:
             remaining_times = {}
         
-        # Create semi-transparent overlay
-        overlay = annotated_image.copy()
-        
         # Panel dimensions
         panel_height = 180
         panel_y = height - panel_height
         
-        # Draw panel background
-        cv2.rectangle(overlay, (0, panel_y), (width, height), (40, 40, 40), -1)
-        
-        # Blend overlay
+        # Blend the panel background into its rows only; a flat grey
+        # overlay reduces the blend to a scale and offset of the ROI
         alpha = 0.75
-        cv2.addWeighted(overlay, alpha, annotated_image, 1 - alpha, 0, annotated_image)
+        panel_roi = annotated_image[max(panel_y, 0):height]
+        cv2.convertScaleAbs(panel_roi, dst=panel_roi, alpha=1 - alpha, beta=alpha * 40)
         
         # Draw title
         cv2.putText(
@@ -496,7 +625,7 @@ class EnhancedVisualizer(Visualizer):
         num_lanes = len(lane_names)
         
         if num_lanes == 0:
-            return Frame(image=annotated_image, frame_number=frame.frame_number, timestamp=frame.timestamp)
+            return self._annotated_frame(frame, annotated_image, inplace)
         
         lane_width = width // num_lanes
         
@@ -509,7 +638,7 @@ class EnhancedVisualizer(Visualizer):
             
             # Draw lane name
             lane_text = lane.capitalize()
-            text_size, _ = cv2.getTextSize(lane_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            text_size = _text_size(lane_text, 0.6, 2)
             cv2.putText(
                 annotated_image,
                 lane_text,
@@ -527,7 +656,7 @@ class EnhancedVisualizer(Visualizer):
             
             # Draw state text
             state_text = state.value.upper()
-            text_size, _ = cv2.getTextSize(state_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            text_size = _text_size(state_text, 0.5, 1)
             cv2.putText(
                 annotated_image,
                 state_text,
@@ -541,7 +670,7 @@ class EnhancedVisualizer(Visualizer):
             # Draw remaining time
             if remaining > 0:
                 time_text = f"{int(remaining)}s"
-                text_size, _ = cv2.getTextSize(time_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                text_size = _text_size(time_text, 0.5, 1)
                 cv2.putText(
                     annotated_image,
                     time_text,
@@ -552,16 +681,13 @@ class EnhancedVisualizer(Visualizer):
                     1
                 )
         
-        return Frame(
-            image=annotated_image,
-            frame_number=frame.frame_number,
-            timestamp=frame.timestamp
-        )
+        return self._annotated_frame(frame, annotated_image, inplace)
     
     def draw_metrics_overlay(
         self,
         frame: Frame,
-        metrics: Dict[str, Any]
+        metrics: Dict[str, Any],
+        inplace: bool = False
     ) -> Frame:
         """
         Draw comprehensive metrics overlay on the frame.
@@ -569,29 +695,25 @@ class EnhancedVisualizer(Visualizer):
         Args:
             frame: Frame object containing the image
             metrics: Dictionary of metrics to display
+            inplace: Draw on frame.image itself and return frame, instead of a copy
             
         Returns:
             Frame with metrics overlay
         """
-        annotated_image = frame.image.copy()
+        annotated_image = frame.image if inplace else frame.image.copy()
         height, width = annotated_image.shape[:2]
         
-        # Create semi-transparent background for metrics
-        overlay = annotated_image.copy()
+        # Semi-transparent background for metrics, blended within its box
         metrics_width = 300
         metrics_height = min(400, height - 200)
         
-        cv2.rectangle(
-            overlay,
-            (width - metrics_width - 10, 10),
-            (width - 10, 10 + metrics_height),
-            (30, 30, 30),
-            -1
-        )
+        # Box corners are inclusive and may be given in either order
+        x1, x2 = sorted((width - metrics_width - 10, width - 10))
+        y1, y2 = sorted((10, 10 + metrics_height))
+        metrics_roi = annotated_image[max(y1, 0):y2 + 1, max(x1, 0):x2 + 1]
         
-        # Blend overlay
         alpha = 0.7
-        cv2.addWeighted(overlay, alpha, annotated_image, 1 - alpha, 0, annotated_image)
+        cv2.convertScaleAbs(metrics_roi, dst=metrics_roi, alpha=1 - alpha, beta=alpha * 30)
         
         # Draw metrics title
         y_offset = 35
@@ -609,16 +731,7 @@ class EnhancedVisualizer(Visualizer):
         
         # Draw each metric
         for key, value in metrics.items():
-            # Format the key (convert snake_case to Title Case)
-            display_key = key.replace('_', ' ').title()
-            
-            # Format the value
-            if isinstance(value, float):
-                display_value = f"{value:.2f}"
-            else:
-                display_value = str(value)
-            
-            metric_text = f"{display_key}: {display_value}"
+            metric_text = self._metric_text(key, value)
             
             cv2.putText(
                 annotated_image,
@@ -636,11 +749,42 @@ class EnhancedVisualizer(Visualizer):
             if y_offset > 10 + metrics_height - 20:
                 break
         
-        return Frame(
-            image=annotated_image,
-            frame_number=frame.frame_number,
-            timestamp=frame.timestamp
-        )
+        return self._annotated_frame(frame, annotated_image, inplace)
+    
+    def _metric_text(self, key: str, value: Any) -> str:
+        """
+        Format one metrics overlay line, reusing the previous frame's text
+        while the value is unchanged.
+        
+        Args:
+            key: Metric name in snake_case
+            value: Metric value
+        
+        Returns:
+            Line of the form "Display Key: value"
+        """
+        cached = self._metric_line_cache.get(key)
+        # Compare types too, since 1, 1.0 and True are equal but format differently
+        if cached is not None and type(cached[0]) is type(value) and cached[0] == value:
+            return cached[1]
+        
+        # Format the key (convert snake_case to Title Case)
+        display_key = self._metric_key_cache.get(key)
+        if display_key is None:
+            display_key = key.replace('_', ' ').title()
+            self._metric_key_cache[key] = display_key
+        
+        # Format the value
+        if isinstance(value, float):
+            display_value = f"{value:.2f}"
+        else:
+            display_value = str(value)
+        
+        metric_text = f"{display_key}: {display_value}"
+        # Only immutable scalars can be compared safely on the next frame
+        if type(value) in (str, int, float, bool):
+            self._metric_line_cache[key] = (value, metric_text)
+        return metric_text
     
     def create_split_view(
         self,
@@ -690,14 +834,14 @@ class EnhancedVisualizer(Visualizer):
         height: int
     ) -> np.ndarray:
         """Create horizontal split layout."""
-        resized_frames = []
         new_width = width // len(frames)
         
-        for frame in frames:
-            resized = cv2.resize(frame.image, (new_width, height))
-            resized_frames.append(resized)
+        # Resize each frame straight into its column of the output
+        canvas = np.empty((height, new_width * len(frames), 3), dtype=np.uint8)
+        for idx, frame in enumerate(frames):
+            self._resize_into(frame.image, canvas[:, idx * new_width:(idx + 1) * new_width])
         
-        return np.hstack(resized_frames)
+        return canvas
     
     def _create_vertical_layout(
         self,
@@ -706,14 +850,14 @@ class EnhancedVisualizer(Visualizer):
         height: int
     ) -> np.ndarray:
         """Create vertical split layout."""
-        resized_frames = []
         new_height = height // len(frames)
         
-        for frame in frames:
-            resized = cv2.resize(frame.image, (width, new_height))
-            resized_frames.append(resized)
+        # Resize each frame straight into its row of the output
+        canvas = np.empty((new_height * len(frames), width, 3), dtype=np.uint8)
+        for idx, frame in enumerate(frames):
+            self._resize_into(frame.image, canvas[idx * new_height:(idx + 1) * new_height])
         
-        return np.vstack(resized_frames)
+        return canvas
     
     def _create_grid_layout(
         self,
@@ -724,31 +868,45 @@ class EnhancedVisualizer(Visualizer):
         """Create grid layout (2x2, 3x3, etc.)."""
         num_frames = len(frames)
         
-        # Calculate grid dimensions
-        cols = int(np.ceil(np.sqrt(num_frames)))
-        rows = int(np.ceil(num_frames / cols))
+        # Calculate grid dimensions: cols = ceil(sqrt(n)), rows = ceil(n / cols),
+        # in exact integer arithmetic
+        cols = math.isqrt(num_frames - 1) + 1
+        rows = -(-num_frames // cols)
         
         cell_width = width // cols
         cell_height = height // rows
         
-        # Create blank canvas
-        canvas = np.zeros((rows * cell_height, cols * cell_width, 3), dtype=np.uint8)
-        
+        # Resize each frame straight into its cell of a reusable (cells, h, w, 3)
+        # buffer; cells past the last frame stay blank
+        cells = self._grid_cell_buffer(rows * cols, cell_height, cell_width)
         for idx, frame in enumerate(frames):
-            row = idx // cols
-            col = idx % cols
-            
-            resized = cv2.resize(frame.image, (cell_width, cell_height))
-            
-            y_start = row * cell_height
-            y_end = y_start + cell_height
-            x_start = col * cell_width
-            x_end = x_start + cell_width
-            
-            canvas[y_start:y_end, x_start:x_end] = resized
+            self._resize_into(frame.image, cells[idx])
+        cells[num_frames:] = 0
+        
+        # Tile the cells row-major into the canvas with one contiguous copy
+        canvas = cells.reshape(rows, cols, cell_height, cell_width, 3).transpose(0, 2, 1, 3, 4).reshape(
+            rows * cell_height, cols * cell_width, 3
+        )
         
         return canvas
     
+    @staticmethod
+    def _resize_into(image: np.ndarray, target: np.ndarray) -> None:
+        """Resize image to fill target, a (sub)array of a layout canvas."""
+        height, width = target.shape[:2]
+        resized = cv2.resize(image, (width, height), dst=target)
+        if resized is not target:
+            # OpenCV could not write into target (e.g. a non-uint8 frame) and
+            # allocated its own output
+            target[...] = resized
+    
+    def _grid_cell_buffer(self, num_cells: int, cell_height: int, cell_width: int) -> np.ndarray:
+        """Get the reusable uint8 cell buffer for grid layouts, reallocating only when its shape changes."""
+        shape = (num_cells, cell_height, cell_width, 3)
+        if self._grid_cells is None or self._grid_cells.shape != shape:
+            self._grid_cells = np.zeros(shape, dtype=np.uint8)
+        return self._grid_cells
+    
     def _create_pip_layout(
         self,
         frames: List[Frame],
@@ -6,15 +6,18 @@ Implements graceful degradation and resource monitoring.
 """
 
 import logging
+import logging.handlers
+import queue
 import sys
 import traceback
 import time
 import psutil
-from typing import Optional, Callable, Any, Dict
+from typing import Optional, Callable, Any, Dict, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from functools import wraps
 import threading
+from collections import defaultdict, deque
 
 
 class ErrorSeverity(Enum):
@@ -33,23 +36,43 @@ class SystemState(Enum):
     SHUTDOWN = "shutdown"
 
 
-@dataclass
+@dataclass(init=False)
 class ErrorContext:
     """Context information for an error"""
+    # Slotted to keep the error history small; __slots__ cannot coexist with
+    # class-level field defaults, so the defaults live on __init__ instead
+    __slots__ = ('component', 'operation', 'error_type', 'message', 'severity',
+                 'timestamp', 'traceback_str', 'recovery_attempted', 'recovery_successful')
+    
     component: str
     operation: str
     error_type: str
     message: str
     severity: ErrorSeverity
     timestamp: float
-    traceback_str: Optional[str] = None
-    recovery_attempted: bool = False
-    recovery_successful: bool = False
+    traceback_str: Optional[str]
+    recovery_attempted: bool
+    recovery_successful: bool
+    
+    def __init__(self, component: str, operation: str, error_type: str, message: str,
+                 severity: ErrorSeverity, timestamp: float, traceback_str: Optional[str] = None,
+                 recovery_attempted: bool = False, recovery_successful: bool = False):
+        self.component = component
+        self.operation = operation
+        self.error_type = error_type
+        self.message = message
+        self.severity = severity
+        self.timestamp = timestamp
+        self.traceback_str = traceback_str
+        self.recovery_attempted = recovery_attempted
+        self.recovery_successful = recovery_successful
 
 
 @dataclass
 class ResourceMetrics:
     """System resource metrics"""
+    __slots__ = ('cpu_percent', 'memory_percent', 'memory_available_mb', 'timestamp')
+    
     cpu_percent: float
     memory_percent: float
     memory_available_mb: float
@@ -74,11 +97,36 @@ class ErrorHandler:
     MEMORY_WARNING_THRESHOLD = 80.0  # percent
     MEMORY_CRITICAL_THRESHOLD = 90.0  # percent
     
+    # Monitoring backoff: after this many consecutive quiet samples (both
+    # readings below this fraction of their warning threshold) the sampling
+    # interval doubles, up to the cap
+    MONITOR_QUIET_SAMPLES = 4
+    MONITOR_QUIET_FRACTION = 0.5
+    MONITOR_MAX_INTERVAL = 60.0  # seconds
+    
+    # Delay before the first sample: long enough for a CPU reading, short
+    # enough that throttling has data soon after monitoring starts
+    MONITOR_FIRST_SAMPLE_DELAY = 1.0  # seconds
+    
     # Error rate thresholds
     ERROR_RATE_WINDOW = 60.0  # seconds
     ERROR_RATE_WARNING = 10  # errors per minute
     ERROR_RATE_CRITICAL = 30  # errors per minute
     
+    # Innermost frames kept in logged tracebacks
+    TRACEBACK_LIMIT = 20
+    
+    # Log file records buffered between writes
+    LOG_FILE_BUFFER_RECORDS = 256
+    
+    # Logging level used for each error severity
+    SEVERITY_LOG_LEVELS = {
+        ErrorSeverity.INFO: logging.INFO,
+        ErrorSeverity.WARNING: logging.WARNING,
+        ErrorSeverity.ERROR: logging.ERROR,
+        ErrorSeverity.CRITICAL: logging.CRITICAL
+    }
+    
     def __init__(self, log_file: Optional[str] = None):
         """
         Initialize error handler.
@@ -87,20 +135,29 @@ class ErrorHandler:
             log_file: Path to log file (None for console only)
         """
         self.log_file = log_file
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
+        self._queue_handler: Optional[logging.handlers.QueueHandler] = None
         self.logger = self._setup_logging()
         
         # Error tracking
-        self.error_history: list[ErrorContext] = []
-        self.error_counts: Dict[str, int] = {}
         self.max_history = 1000
+        self.error_history: deque[ErrorContext] = deque(maxlen=self.max_history)
+        # Timestamps of errors inside ERROR_RATE_WINDOW, oldest first (see _count_recent_errors)
+        self._recent_error_times: deque[float] = deque(maxlen=self.max_history)
+        self.error_counts: Dict[str, int] = defaultdict(int)
+        # Log record `extra` dicts, one per component (logging only reads them)
+        self._log_extras: Dict[str, Dict[str, str]] = {}
         
         # System state
         self.current_state = SystemState.NORMAL
         self.degraded_components: set[str] = set()
         
         # Resource monitoring
-        self.resource_metrics: list[ResourceMetrics] = []
         self.max_metrics = 100
+        self.resource_metrics: deque[ResourceMetrics] = deque(maxlen=self.max_metrics)
+        # Latest readings as bare floats for should_throttle (0.0 until the first sample)
+        self._last_cpu_percent = 0.0
+        self._last_memory_percent = 0.0
         self.monitoring_enabled = True
         self.monitor_thread: Optional[threading.Thread] = None
         self._stop_monitoring = threading.Event()
@@ -114,11 +171,15 @@ class ErrorHandler:
         """
         Set up logging configuration.
         
+        Records are put on a queue by the calling thread and written out by a
+        QueueListener thread, so callers never block on console or file I/O.
+        
         Returns:
             Configured logger
         """
         logger = logging.getLogger('smart_flow_v2')
         logger.setLevel(logging.DEBUG)
+        handlers = []
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -128,7 +189,7 @@ class ErrorHandler:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler (if specified)
         if self.log_file:
@@ -139,10 +200,51 @@ class ErrorHandler:
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            
+            # Batch file writes; ERROR and above flush straight away
+            buffered_file_handler = logging.handlers.MemoryHandler(
+                capacity=self.LOG_FILE_BUFFER_RECORDS,
+                flushLevel=logging.ERROR,
+                target=file_handler,
+                flushOnClose=True
+            )
+            buffered_file_handler.setLevel(file_handler.level)
+            handlers.append(buffered_file_handler)
+        
+        # The queue handler only enqueues what at least one output handler
+        # would emit (this also keeps _debug_enabled accurate)
+        self._queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        self._queue_handler.setLevel(min(handler.level for handler in handlers))
+        self._log_listener = logging.handlers.QueueListener(
+            self._queue_handler.queue,
+            *handlers,
+            respect_handler_level=True
+        )
+        self._log_listener.start()
+        logger.addHandler(self._queue_handler)
         
         return logger
     
+    def _debug_enabled(self) -> bool:
+        """
+        Check whether a DEBUG record would reach any handler.
+        
+        The logger itself always accepts DEBUG (the file handler wants it),
+        so the handler levels along the propagation chain decide.
+        
+        Returns:
+            True if some handler emits DEBUG records, False otherwise
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        
+        logger: Optional[logging.Logger] = self.logger
+        while logger:
+            if any(handler.level <= logging.DEBUG for handler in logger.handlers):
+                return True
+            logger = logger.parent if logger.propagate else None
+        return False
+    
     def log_error(self, context: ErrorContext) -> None:
         """
         Log an error with context.
@@ -150,31 +252,32 @@ class ErrorHandler:
         Args:
             context: Error context information
         """
-        # Add to history
+        # Add to history (the deque drops the oldest entry once full)
         self.error_history.append(context)
-        if len(self.error_history) > self.max_history:
-            self.error_history = self.error_history[-self.max_history:]
+        if context.timestamp >= time.time() - self.ERROR_RATE_WINDOW:
+            self._recent_error_times.append(context.timestamp)
         
         # Update error counts
-        key = f"{context.component}:{context.error_type}"
-        self.error_counts[key] = self.error_counts.get(key, 0) + 1
+        self.error_counts[f"{context.component}:{context.error_type}"] += 1
         
         # Log based on severity
-        extra = {'component': context.component}
-        message = f"[{context.component}] {context.operation}: {context.message}"
-        
-        if context.severity == ErrorSeverity.INFO:
-            self.logger.info(message, extra=extra)
-        elif context.severity == ErrorSeverity.WARNING:
-            self.logger.warning(message, extra=extra)
-        elif context.severity == ErrorSeverity.ERROR:
-            self.logger.error(message, extra=extra)
-            if context.traceback_str:
-                self.logger.debug(f"Traceback:\n{context.traceback_str}", extra=extra)
-        elif context.severity == ErrorSeverity.CRITICAL:
-            self.logger.critical(message, extra=extra)
-            if context.traceback_str:
-                self.logger.debug(f"Traceback:\n{context.traceback_str}", extra=extra)
+        # Arguments are formatted lazily, only if a handler emits the record
+        extra = self._log_extras.get(context.component)
+        if extra is None:
+            extra = self._log_extras[context.component] = {'component': context.component}
+        level = self.SEVERITY_LOG_LEVELS[context.severity]
+        self.logger.log(
+            level,
+            "[%s] %s: %s",
+            context.component,
+            context.operation,
+            context.message,
+            extra=extra
+        )
+        
+        # Tracebacks accompany errors only
+        if level >= logging.ERROR and context.traceback_str and self._debug_enabled():
+            self.logger.debug("Traceback:\n%s", context.traceback_str, extra=extra)
         
         # Check error rate
         self._check_error_rate()
@@ -200,15 +303,26 @@ class ErrorHandler:
         Returns:
             True if recovered successfully, False otherwise
         """
-        # Create error context
+        # Formatting the traceback walks the stack, so only do it when
+        # log_error will actually emit it
+        traceback_str = None
+        if severity in (ErrorSeverity.ERROR, ErrorSeverity.CRITICAL) and self._debug_enabled():
+            # Formatted from the exception itself, so this also works outside
+            # an except block; deep stacks keep only the frames nearest the raise
+            traceback_str = "".join(
+                traceback.TracebackException.from_exception(exception, limit=-self.TRACEBACK_LIMIT).format()
+            )
+        
+        # Create error context (labels come from small fixed sets, so intern
+        # them to share one string per label across the history)
         context = ErrorContext(
-            component=component,
-            operation=operation,
-            error_type=type(exception).__name__,
+            component=sys.intern(component),
+            operation=sys.intern(operation),
+            error_type=sys.intern(type(exception).__name__),
             message=str(exception),
             severity=severity,
             timestamp=time.time(),
-            traceback_str=traceback.format_exc()
+            traceback_str=traceback_str
         )
         
         # Log the error
@@ -218,14 +332,14 @@ class ErrorHandler:
         if recovery_strategy and recovery_strategy in self.recovery_strategies:
             context.recovery_attempted = True
             try:
-                self.logger.info(f"Attempting recovery: {recovery_strategy}")
+                self.logger.info("Attempting recovery: %s", recovery_strategy)
                 recovery_func = self.recovery_strategies[recovery_strategy]
                 recovery_func(exception)
                 context.recovery_successful = True
-                self.logger.info(f"Recovery successful: {recovery_strategy}")
+                self.logger.info("Recovery successful: %s", recovery_strategy)
                 return True
             except Exception as recovery_error:
-                self.logger.error(f"Recovery failed: {recovery_error}")
+                self.logger.error("Recovery failed: %s", recovery_error)
                 context.recovery_successful = False
         
         # Update system state based on severity
@@ -243,7 +357,7 @@ class ErrorHandler:
             strategy: Recovery function
         """
         self.recovery_strategies[name] = strategy
-        self.logger.debug(f"Registered recovery strategy: {name}")
+        self.logger.debug("Registered recovery strategy: %s", name)
     
     def _degrade_component(self, component: str) -> None:
         """
@@ -253,7 +367,7 @@ class ErrorHandler:
             component: Component name
         """
         self.degraded_components.add(component)
-        self.logger.warning(f"Component degraded: {component}")
+        self.logger.warning("Component degraded: %s", component)
         
         # Update system state
         if len(self.degraded_components) >= 3:
@@ -272,7 +386,7 @@ class ErrorHandler:
         """
         if component in self.degraded_components:
             self.degraded_components.remove(component)
-            self.logger.info(f"Component restored: {component}")
+            self.logger.info("Component restored: %s", component)
             
             # Update system state
             if len(self.degraded_components) == 0:
@@ -302,20 +416,33 @@ class ErrorHandler:
         """
         return self.current_state
     
+    def _count_recent_errors(self) -> int:
+        """
+        Count errors logged within ERROR_RATE_WINDOW.
+        
+        Timestamps that have aged out are dropped from the front of the
+        window, so each one is discarded once instead of rescanning the
+        whole history on every call.
+        
+        Returns:
+            Number of recent errors
+        """
+        cutoff_time = time.time() - self.ERROR_RATE_WINDOW
+        recent_error_times = self._recent_error_times
+        while recent_error_times and recent_error_times[0] < cutoff_time:
+            recent_error_times.popleft()
+        return len(recent_error_times)
+    
     def _check_error_rate(self) -> None:
         """Check if error rate exceeds thresholds."""
-        current_time = time.time()
-        cutoff_time = current_time - self.ERROR_RATE_WINDOW
-        
         # Count recent errors
-        recent_errors = [e for e in self.error_history if e.timestamp >= cutoff_time]
-        error_rate = len(recent_errors)
+        error_rate = self._count_recent_errors()
         
         if error_rate >= self.ERROR_RATE_CRITICAL:
-            self.logger.critical(f"Critical error rate: {error_rate} errors in last minute")
+            self.logger.critical("Critical error rate: %d errors in last minute", error_rate)
             self.current_state = SystemState.CRITICAL
         elif error_rate >= self.ERROR_RATE_WARNING:
-            self.logger.warning(f"High error rate: {error_rate} errors in last minute")
+            self.logger.warning("High error rate: %d errors in last minute", error_rate)
     
     def start_resource_monitoring(self, interval: float = 5.0) -> None:
         """
@@ -334,7 +461,7 @@ class ErrorHandler:
             daemon=True
         )
         self.monitor_thread.start()
-        self.logger.info(f"Resource monitoring started (interval: {interval}s)")
+        self.logger.info("Resource monitoring started (interval: %ss)", interval)
     
     def stop_resource_monitoring(self) -> None:
         """Stop background resource monitoring."""
@@ -350,10 +477,18 @@ class ErrorHandler:
         Args:
             interval: Monitoring interval in seconds
         """
-        while not self._stop_monitoring.is_set():
+        # Prime the CPU counter: non-blocking calls report usage since the
+        # previous call, so each sample covers exactly one interval
+        psutil.cpu_percent(interval=None)
+        current_interval = interval
+        quiet_samples = 0
+        wait_time = min(interval, self.MONITOR_FIRST_SAMPLE_DELAY)
+        
+        # Sleep until next check (returns early, and ends the loop, on stop)
+        while not self._stop_monitoring.wait(wait_time):
             try:
                 # Get resource metrics
-                cpu_percent = psutil.cpu_percent(interval=1.0)
+                cpu_percent = psutil.cpu_percent(interval=None)
                 memory = psutil.virtual_memory()
                 memory_percent = memory.percent
                 memory_available_mb = memory.available / (1024 * 1024)
@@ -365,30 +500,65 @@ class ErrorHandler:
                     timestamp=time.time()
                 )
                 
-                # Store metrics
+                # Store metrics (the deque drops the oldest entry once full)
                 self.resource_metrics.append(metrics)
-                if len(self.resource_metrics) > self.max_metrics:
-                    self.resource_metrics = self.resource_metrics[-self.max_metrics:]
+                self._last_cpu_percent = cpu_percent
+                self._last_memory_percent = memory_percent
                 
                 # Check thresholds
                 if cpu_percent >= self.CPU_CRITICAL_THRESHOLD:
-                    self.logger.critical(f"Critical CPU usage: {cpu_percent:.1f}%")
+                    self.logger.critical("Critical CPU usage: %.1f%%", cpu_percent)
                     self.current_state = SystemState.CRITICAL
                 elif cpu_percent >= self.CPU_WARNING_THRESHOLD:
-                    self.logger.warning(f"High CPU usage: {cpu_percent:.1f}%")
+                    self.logger.warning("High CPU usage: %.1f%%", cpu_percent)
                 
                 if memory_percent >= self.MEMORY_CRITICAL_THRESHOLD:
-                    self.logger.critical(f"Critical memory usage: {memory_percent:.1f}%")
+                    self.logger.critical("Critical memory usage: %.1f%%", memory_percent)
                     self.current_state = SystemState.CRITICAL
                 elif memory_percent >= self.MEMORY_WARNING_THRESHOLD:
-                    self.logger.warning(f"High memory usage: {memory_percent:.1f}%")
-                
-                # Sleep until next check
-                time.sleep(interval)
+                    self.logger.warning("High memory usage: %.1f%%", memory_percent)
                 
+                current_interval, quiet_samples = self._next_monitor_interval(
+                    interval, current_interval, quiet_samples, cpu_percent, memory_percent
+                )
+            
             except Exception as e:
-                self.logger.error(f"Error in resource monitoring: {e}")
-                time.sleep(interval)
+                self.logger.error("Error in resource monitoring: %s", e)
+            
+            wait_time = current_interval
+    
+    def _next_monitor_interval(
+        self,
+        base_interval: float,
+        current_interval: float,
+        quiet_samples: int,
+        cpu_percent: float,
+        memory_percent: float
+    ) -> Tuple[float, int]:
+        """
+        Adapt the monitoring interval to the latest sample.
+        
+        Quiet systems are sampled less and less often; any busier sample
+        returns to the configured interval.
+        
+        Args:
+            base_interval: Configured monitoring interval in seconds
+            current_interval: Interval used for the latest sample
+            quiet_samples: Consecutive quiet samples before the latest one
+            cpu_percent: Latest CPU usage
+            memory_percent: Latest memory usage
+        
+        Returns:
+            Tuple of (next interval, consecutive quiet samples)
+        """
+        if (cpu_percent >= self.CPU_WARNING_THRESHOLD * self.MONITOR_QUIET_FRACTION or
+                memory_percent >= self.MEMORY_WARNING_THRESHOLD * self.MONITOR_QUIET_FRACTION):
+            return base_interval, 0
+        
+        quiet_samples += 1
+        if quiet_samples >= self.MONITOR_QUIET_SAMPLES:
+            current_interval = min(current_interval * 2, max(self.MONITOR_MAX_INTERVAL, base_interval))
+        return current_interval, quiet_samples
     
     def get_resource_metrics(self) -> Optional[ResourceMetrics]:
         """
@@ -408,11 +578,9 @@ class ErrorHandler:
         Returns:
             True if should throttle, False otherwise
         """
-        metrics = self.get_resource_metrics()
-        if metrics:
-            return (metrics.cpu_percent >= self.CPU_WARNING_THRESHOLD or
-                    metrics.memory_percent >= self.MEMORY_WARNING_THRESHOLD)
-        return False
+        # Without samples both readings are 0.0, so this is False
+        return (self._last_cpu_percent >= self.CPU_WARNING_THRESHOLD or
+                self._last_memory_percent >= self.MEMORY_WARNING_THRESHOLD)
     
     def get_error_summary(self) -> Dict[str, Any]:
         """
@@ -421,17 +589,15 @@ class ErrorHandler:
         Returns:
             Dictionary with error statistics
         """
-        current_time = time.time()
-        cutoff_time = current_time - self.ERROR_RATE_WINDOW
-        recent_errors = [e for e in self.error_history if e.timestamp >= cutoff_time]
+        recent_errors = self._count_recent_errors()
         
         return {
             'total_errors': len(self.error_history),
-            'recent_errors': len(recent_errors),
-            'error_rate': len(recent_errors) / (self.ERROR_RATE_WINDOW / 60.0),
+            'recent_errors': recent_errors,
+            'error_rate': recent_errors / (self.ERROR_RATE_WINDOW / 60.0),
             'system_state': self.current_state.value,
             'degraded_components': list(self.degraded_components),
-            'error_counts': self.error_counts.copy()
+            'error_counts': dict(self.error_counts)
         }
     
     def shutdown(self) -> None:
@@ -439,6 +605,18 @@ class ErrorHandler:
         self.logger.info("Shutting down error handler")
         self.stop_resource_monitoring()
         self.current_state = SystemState.SHUTDOWN
+        
+        # Flush queued records and release the console/file handlers
+        if self._log_listener is not None:
+            self.logger.removeHandler(self._queue_handler)
+            self._log_listener.stop()
+            for handler in self._log_listener.handlers:
+                # Closing a MemoryHandler flushes it but leaves its target open
+                target = handler.target if isinstance(handler, logging.handlers.MemoryHandler) else None
+                handler.close()
+                if target is not None:
+                    target.close()
+            self._log_listener = None
 
 
 def with_error_handling(
@@ -447,7 +625,8 @@ def with_error_handling(
     error_handler: ErrorHandler,
     severity: ErrorSeverity = ErrorSeverity.ERROR,
     recovery_strategy: Optional[str] = None,
-    default_return: Any = None
+    default_return: Any = None,
+    retry: bool = False
 ):
     """
     Decorator for automatic error handling.
@@ -459,6 +638,8 @@ def with_error_handling(
         severity: Error severity level
         recovery_strategy: Recovery strategy name
         default_return: Default return value on error
+        retry: Call the function once more after a successful recovery
+            (only safe for idempotent operations)
         
     Returns:
         Decorated function
@@ -476,12 +657,18 @@ def with_error_handling(
                     severity=severity,
                     recovery_strategy=recovery_strategy
                 )
-                if not recovered:
+                if not (recovered and retry):
                     return default_return
-                # If recovered, try again
+                # If recovered and retry was requested, try once more
                 try:
                     return func(*args, **kwargs)
-                except Exception:
+                except Exception as retry_error:
+                    error_handler.handle_exception(
+                        component=component,
+                        operation=operation,
+                        exception=retry_error,
+                        severity=severity
+                    )
                     return default_return
         return wrapper
     return decorator
@@ -5,11 +5,64 @@ Records simulation data for analysis and validation.
 """
 
 import json
-from typing import Dict, List, Optional, Any
+import math
+from collections import Counter
+from operator import attrgetter
+from typing import BinaryIO, Dict, Iterable, List, Optional, Any
 from pathlib import Path
 from src.models import SignalState
 from dataclasses import asdict
 
+# orjson is optional; without it output is encoded with the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Write buffer for finalize output; large logs are flushed in few syscalls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Log entries encoded per orjson call when streaming finalize output
+LOG_ENTRIES_PER_WRITE = 1024
+
+_detection_fields = attrgetter('vehicles', 'pedestrians', 'emergency_vehicles')
+
+
+def _is_non_finite(value: Any) -> bool:
+    """Check whether value is a NaN or infinite float."""
+    return isinstance(value, float) and not math.isfinite(value)
+
+
+def _any_non_finite(values: Iterable[Any]) -> bool:
+    """
+    Check whether values hold a NaN or infinite float.
+    
+    A NaN or infinity makes the sum non-finite, so a finite sum answers in one
+    pass; overflowing sums and non-numeric values are checked value by value.
+    """
+    try:
+        if math.isfinite(sum(values)):
+            return False
+    except (TypeError, OverflowError):
+        pass
+    return any(map(_is_non_finite, values))
+
+
+def _has_non_finite_float(value: Any) -> bool:
+    """Check whether value holds a NaN or infinite float, searching dicts, lists and tuples."""
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+    return False
+
 
 class MetricsLogger:
     """
@@ -19,14 +72,19 @@ class MetricsLogger:
     throughout the simulation. It provides summary statistics at the end.
     """
     
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, copy_inputs: bool = False):
         """
         Initialize the metrics logger with output file path.
         
+        Logged dicts are stored as passed unless copy_inputs is set, so callers
+        must not mutate them after logging.
+        
         Args:
             output_path: Path to the output JSON file
+            copy_inputs: Store copies of logged dicts instead of the dicts themselves
         """
         self.output_path = output_path
+        self.copy_inputs = copy_inputs
         
         # Storage for logged data
         self._density_logs: List[Dict] = []
@@ -36,7 +94,12 @@ class MetricsLogger:
         # Tracking for summary statistics
         self._cycle_count = 0
         self._lane_waiting_times: Dict[str, List[float]] = {}
+        self._last_red_timestamp: Dict[str, float] = {}  # lane -> time it last turned red
         
+        # Set once a NaN or infinite float is logged, so finalize can pick the
+        # encoder without scanning every log entry
+        self._non_finite_logged = False
+    
     def log_density(self, timestamp: float, densities: Dict[str, float]) -> None:
         """
         Log vehicle density measurements for each lane.
@@ -47,9 +110,12 @@ class MetricsLogger:
         """
         log_entry = {
             'timestamp': timestamp,
-            'densities': densities.copy()
+            'densities': densities.copy() if self.copy_inputs else densities
         }
         self._density_logs.append(log_entry)
+        
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(timestamp) or _any_non_finite(densities.values())
     
     def log_signal_allocation(self, timestamp: float, green_times: Dict[str, int]) -> None:
         """
@@ -61,10 +127,13 @@ class MetricsLogger:
         """
         log_entry = {
             'timestamp': timestamp,
-            'green_times': green_times.copy()
+            'green_times': green_times.copy() if self.copy_inputs else green_times
         }
         self._allocation_logs.append(log_entry)
         
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(timestamp) or _any_non_finite(green_times.values())
+        
         # Increment cycle count when allocation happens
         self._cycle_count += 1
     
@@ -92,6 +161,9 @@ class MetricsLogger:
         }
         self._transition_logs.append(log_entry)
         
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(timestamp)
+        
         # Track waiting times (time spent in red state)
         if old_state == SignalState.RED and new_state == SignalState.GREEN:
             # Lane is getting green signal, calculate waiting time
@@ -99,15 +171,14 @@ class MetricsLogger:
                 self._lane_waiting_times[lane] = []
             
             # Find the last time this lane went red
-            last_red_time = None
-            for transition in reversed(self._transition_logs[:-1]):  # Exclude current transition
-                if transition['lane'] == lane and transition['new_state'] == 'red':
-                    last_red_time = transition['timestamp']
-                    break
+            last_red_time = self._last_red_timestamp.get(lane)
             
             if last_red_time is not None:
                 waiting_time = timestamp - last_red_time
                 self._lane_waiting_times[lane].append(waiting_time)
+        
+        if new_state == SignalState.RED:
+            self._last_red_timestamp[lane] = timestamp
     
     def finalize(self) -> None:
         """
@@ -140,12 +211,79 @@ class MetricsLogger:
             'transition_logs': self._transition_logs
         }
         
+        # Logs were checked for NaN and infinities as they were logged; only
+        # the summary is scanned here
+        has_non_finite = self._non_finite_logged or _has_non_finite_float(summary)
+        
         # Write to file
+        self._write_output(output_data, has_non_finite)
+    
+    def _write_output(self, output_data: Dict[str, Any], has_non_finite: bool) -> None:
+        """
+        Write output data as indented JSON, creating parent directories.
+        
+        Uses orjson when available, which encodes large logs several times
+        faster than the standard json module. The file parses back to the same
+        data either way, but the text differs: orjson leaves non-ASCII characters
+        unescaped and formats some floats differently (1e-7 rather than 1e-07).
+        orjson would write NaN and infinities as null, so data containing them
+        is written with json, which keeps them as NaN and Infinity.
+        
+        Args:
+            output_data: JSON-serializable data to write
+            has_non_finite: Whether output_data holds a NaN or infinite float
+        """
         output_path = Path(self.output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
+        if ORJSON_AVAILABLE and not has_non_finite:
+            try:
+                with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+                    self._write_orjson_sections(f, output_data)
+                return
+            except TypeError:
+                # orjson rejects some values json accepts (e.g. integers wider
+                # than 64 bits); the file is rewritten below
+                pass
+        
+        with open(output_path, 'w', buffering=OUTPUT_BUFFER_SIZE) as f:
             json.dump(output_data, f, indent=2)
+    
+    @staticmethod
+    def _write_orjson_sections(f: BinaryIO, output_data: Dict[str, Any]) -> None:
+        """
+        Write a JSON object with orjson, streaming the log lists in batches.
+        
+        Top-level values are encoded one at a time, and non-empty lists (the
+        logs) LOG_ENTRIES_PER_WRITE entries at a time, so only one batch is
+        held encoded at once rather than the whole document. The output is the
+        same as encoding output_data in one go with OPT_INDENT_2.
+        
+        Args:
+            f: File opened for binary writing
+            output_data: JSON-serializable data to write
+        """
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        
+        # Newlines only occur between tokens (strings escape theirs), so
+        # replacing them nests encoded values one level deeper
+        f.write(b'{')
+        for index, (key, value) in enumerate(output_data.items()):
+            f.write(b',\n  ' if index else b'\n  ')
+            f.write(orjson.dumps(str(key)))
+            f.write(b': ')
+            if isinstance(value, list) and value:
+                f.write(b'[')
+                for start in range(0, len(value), LOG_ENTRIES_PER_WRITE):
+                    batch = orjson.dumps(value[start:start + LOG_ENTRIES_PER_WRITE], option=option)
+                    if start:
+                        f.write(b',')
+                    # Strip the batch's own b'[' and b'\n]'
+                    f.write(batch[1:-2].replace(b'\n', b'\n  '))
+                f.write(b'\n  ]')
+            else:
+                f.write(orjson.dumps(value, option=option).replace(b'\n', b'\n  '))
+        f.write(b'\n}' if output_data else b'}')
 
 
 
@@ -164,14 +302,15 @@ class EnhancedMetricsLogger(MetricsLogger):
     - Comprehensive report generation
     """
     
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, copy_inputs: bool = False):
         """
         Initialize the enhanced metrics logger.
         
         Args:
             output_path: Path to the output JSON file
+            copy_inputs: Store copies of logged dicts instead of the dicts themselves
         """
-        super().__init__(output_path)
+        super().__init__(output_path, copy_inputs)
         
         # Additional storage for enhanced metrics
         self._detection_logs: List[Dict] = []
@@ -184,8 +323,16 @@ class EnhancedMetricsLogger(MetricsLogger):
         # Tracking for per-vehicle metrics
         self._vehicle_tracking: Dict[int, Dict] = {}  # vehicle_id -> {entry_time, exit_time, stops}
         
-        # Throughput tracking
-        self._lane_throughput: Dict[str, List[float]] = {}  # lane -> list of timestamps
+        # Running queue statistics per lane, updated as queue metrics are logged
+        self._queue_length_sum: Dict[str, float] = {}
+        self._queue_samples: Dict[str, int] = {}
+        self._queue_length_max: Dict[str, float] = {}
+        self._spillback_counts: Dict[str, int] = {}
+        
+        # Throughput tracking: vehicles per lane and the first/last time any passed
+        self._lane_throughput_count: Dict[str, int] = {}
+        self._lane_throughput_first: Dict[str, float] = {}
+        self._lane_throughput_last: Dict[str, float] = {}
         
         # Environmental impact tracking
         self._total_idle_time: float = 0.0
@@ -199,29 +346,39 @@ class EnhancedMetricsLogger(MetricsLogger):
             timestamp: Simulation timestamp in seconds
             result: DetectionResult object with vehicles, pedestrians, emergency_vehicles
         """
-        # Extract detection counts
-        vehicle_count = len(result.vehicles) if hasattr(result, 'vehicles') else 0
-        pedestrian_count = len(result.pedestrians) if hasattr(result, 'pedestrians') else 0
-        emergency_count = len(result.emergency_vehicles) if hasattr(result, 'emergency_vehicles') else 0
+        # Extract detection collections in one lookup; objects missing any of
+        # them fall back to per-attribute defaults
+        try:
+            vehicles, pedestrians, emergency_vehicles = _detection_fields(result)
+        except AttributeError:
+            vehicles = getattr(result, 'vehicles', ())
+            pedestrians = getattr(result, 'pedestrians', ())
+            emergency_vehicles = getattr(result, 'emergency_vehicles', ())
         
         # Create log entry
         log_entry = {
             'timestamp': timestamp,
-            'vehicle_count': vehicle_count,
-            'pedestrian_count': pedestrian_count,
-            'emergency_vehicle_count': emergency_count
+            'vehicle_count': len(vehicles),
+            'pedestrian_count': len(pedestrians),
+            'emergency_vehicle_count': len(emergency_vehicles)
         }
         
         # Add vehicle type breakdown if available
-        if hasattr(result, 'vehicles') and result.vehicles:
-            vehicle_types: Dict[str, int] = {}
-            for vehicle in result.vehicles:
-                if hasattr(vehicle, 'class_name'):
-                    vtype = vehicle.class_name
-                    vehicle_types[vtype] = vehicle_types.get(vtype, 0) + 1
-            log_entry['vehicle_types'] = vehicle_types
+        if vehicles:
+            try:
+                vehicle_types = Counter(vehicle.class_name for vehicle in vehicles)
+            except AttributeError:
+                # Vehicles without a class name are left out of the breakdown
+                vehicle_types = Counter(
+                    vehicle.class_name for vehicle in vehicles
+                    if hasattr(vehicle, 'class_name')
+                )
+            log_entry['vehicle_types'] = dict(vehicle_types)
         
         self._detection_logs.append(log_entry)
+        
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(timestamp)
     
     def log_queue_metrics(self, timestamp: float, metrics: Dict[str, Any]) -> None:
         """
@@ -251,6 +408,22 @@ class EnhancedMetricsLogger(MetricsLogger):
             
             log_entry['queues'][lane] = queue_data
             
+            if not self._non_finite_logged:
+                self._non_finite_logged = _any_non_finite(queue_data.values())
+            
+            # Update running queue statistics
+            length_meters = queue_data['length_meters']
+            if lane not in self._queue_samples:
+                self._queue_length_sum[lane] = 0.0
+                self._queue_samples[lane] = 0
+                self._queue_length_max[lane] = 0.0
+                self._spillback_counts[lane] = 0
+            self._queue_length_sum[lane] += length_meters
+            self._queue_samples[lane] += 1
+            self._queue_length_max[lane] = max(self._queue_length_max[lane], length_meters)
+            if queue_data.get('is_spillback', False):
+                self._spillback_counts[lane] += 1
+            
             # Track idle time for environmental impact
             # Vehicles in queue are idling
             if 'vehicle_count' in queue_data:
@@ -258,6 +431,9 @@ class EnhancedMetricsLogger(MetricsLogger):
                 self._idle_vehicle_seconds += queue_data['vehicle_count']
         
         self._queue_logs.append(log_entry)
+        
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(timestamp)
     
     def log_emergency_event(self, event: Any) -> None:
         """
@@ -278,6 +454,9 @@ class EnhancedMetricsLogger(MetricsLogger):
             log_entry = event
         
         self._emergency_logs.append(log_entry)
+        
+        if not self._non_finite_logged:
+            self._non_finite_logged = _has_non_finite_float(log_entry)
     
     def log_pedestrian_activity(self, timestamp: float, crosswalk_data: Dict[str, int]) -> None:
         """
@@ -289,10 +468,13 @@ class EnhancedMetricsLogger(MetricsLogger):
         """
         log_entry = {
             'timestamp': timestamp,
-            'crosswalks': crosswalk_data.copy()
+            'crosswalks': crosswalk_data.copy() if self.copy_inputs else crosswalk_data
         }
         
         self._pedestrian_logs.append(log_entry)
+        
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(timestamp) or _any_non_finite(crosswalk_data.values())
     
     def log_throughput(self, timestamp: float, lane: str, count: int) -> None:
         """
@@ -311,13 +493,21 @@ class EnhancedMetricsLogger(MetricsLogger):
         
         self._throughput_logs.append(log_entry)
         
-        # Track for throughput calculation
-        if lane not in self._lane_throughput:
-            self._lane_throughput[lane] = []
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(timestamp) or _is_non_finite(count)
         
-        # Add timestamp for each vehicle
-        for _ in range(count):
-            self._lane_throughput[lane].append(timestamp)
+        # Track for throughput calculation
+        if lane not in self._lane_throughput_count:
+            self._lane_throughput_count[lane] = 0
+        
+        if count > 0:
+            self._lane_throughput_count[lane] += count
+            if lane in self._lane_throughput_first:
+                self._lane_throughput_first[lane] = min(self._lane_throughput_first[lane], timestamp)
+                self._lane_throughput_last[lane] = max(self._lane_throughput_last[lane], timestamp)
+            else:
+                self._lane_throughput_first[lane] = timestamp
+                self._lane_throughput_last[lane] = timestamp
     
     def log_network_metrics(self, timestamp: float, metrics: Any) -> None:
         """
@@ -341,6 +531,9 @@ class EnhancedMetricsLogger(MetricsLogger):
             log_entry = {'timestamp': timestamp, **metrics}
         
         self._network_logs.append(log_entry)
+        
+        if not self._non_finite_logged:
+            self._non_finite_logged = _has_non_finite_float(log_entry)
     
     def track_vehicle(self, vehicle_id: int, entry_time: float, lane: str) -> None:
         """
@@ -358,6 +551,9 @@ class EnhancedMetricsLogger(MetricsLogger):
             'stops': 0,
             'wait_time': 0.0
         }
+        
+        if not self._non_finite_logged:
+            self._non_finite_logged = _is_non_finite(entry_time)
     
     def vehicle_stopped(self, vehicle_id: int) -> None:
         """
@@ -381,6 +577,9 @@ class EnhancedMetricsLogger(MetricsLogger):
             self._vehicle_tracking[vehicle_id]['exit_time'] = exit_time
             entry_time = self._vehicle_tracking[vehicle_id]['entry_time']
             self._vehicle_tracking[vehicle_id]['wait_time'] = exit_time - entry_time
+            
+            if not self._non_finite_logged:
+                self._non_finite_logged = _is_non_finite(exit_time) or _is_non_finite(exit_time - entry_time)
     
     def calculate_environmental_impact(self) -> Dict[str, float]:
         """
@@ -439,12 +638,15 @@ class EnhancedMetricsLogger(MetricsLogger):
         
         # Calculate throughput statistics
         throughput_by_lane = {}
-        for lane, timestamps in self._lane_throughput.items():
-            if timestamps:
+        for lane, vehicle_count in self._lane_throughput_count.items():
+            if vehicle_count:
                 # Calculate vehicles per hour
-                time_span = max(timestamps) - min(timestamps) if len(timestamps) > 1 else 1.0
+                if vehicle_count > 1:
+                    time_span = self._lane_throughput_last[lane] - self._lane_throughput_first[lane]
+                else:
+                    time_span = 1.0
                 time_span_hours = time_span / 3600.0 if time_span > 0 else 1.0
-                vehicles_per_hour = len(timestamps) / time_span_hours
+                vehicles_per_hour = vehicle_count / time_span_hours
                 throughput_by_lane[lane] = vehicles_per_hour
             else:
                 throughput_by_lane[lane] = 0.0
@@ -454,30 +656,13 @@ class EnhancedMetricsLogger(MetricsLogger):
         total_pedestrians_detected = sum(log['pedestrian_count'] for log in self._detection_logs)
         total_emergency_vehicles = sum(log['emergency_vehicle_count'] for log in self._detection_logs)
         
-        # Calculate queue statistics
-        avg_queue_lengths = {}
-        max_queue_lengths = {}
-        spillback_events = {}
-        
-        for log in self._queue_logs:
-            for lane, queue_data in log['queues'].items():
-                if lane not in avg_queue_lengths:
-                    avg_queue_lengths[lane] = []
-                    max_queue_lengths[lane] = 0.0
-                    spillback_events[lane] = 0
-                
-                avg_queue_lengths[lane].append(queue_data['length_meters'])
-                max_queue_lengths[lane] = max(max_queue_lengths[lane], queue_data['length_meters'])
-                
-                if queue_data.get('is_spillback', False):
-                    spillback_events[lane] += 1
-        
-        # Calculate averages
-        for lane in avg_queue_lengths:
-            if avg_queue_lengths[lane]:
-                avg_queue_lengths[lane] = sum(avg_queue_lengths[lane]) / len(avg_queue_lengths[lane])
-            else:
-                avg_queue_lengths[lane] = 0.0
+        # Calculate queue statistics (accumulated in log_queue_metrics)
+        avg_queue_lengths = {
+            lane: self._queue_length_sum[lane] / samples
+            for lane, samples in self._queue_samples.items()
+        }
+        max_queue_lengths = self._queue_length_max.copy()
+        spillback_events = self._spillback_counts.copy()
         
         # Environmental impact
         environmental_impact = self.calculate_environmental_impact()
@@ -613,9 +798,9 @@ class EnhancedMetricsLogger(MetricsLogger):
             }
         }
         
-        # Write to file
-        output_path = Path(self.output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Logs and tracked vehicles were checked for NaN and infinities as they
+        # were recorded; only the report is scanned here
+        has_non_finite = self._non_finite_logged or _has_non_finite_float(report)
         
-        with open(output_path, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        # Write to file
+        self._write_output(output_data, has_non_finite)
@@ -2,6 +2,8 @@
 Unit tests for configuration loader.
 """
 
+import copy
+import dataclasses
 import pytest
 import json
 import tempfile
@@ -238,6 +240,34 @@ class TestIntersectionConfig:
         assert config.detection.confidence_threshold == 0.5
         assert config.vehicle_weights['bus'] == 2.0
     
+    def test_default_sections_are_shared(self):
+        """Test intersections without overrides share frozen default sections."""
+        config_data = {
+            'intersection': {'id': 'a', 'name': 'A', 'video_source': 'a.mp4'},
+            'lanes': {}
+        }
+        
+        first = IntersectionConfig.from_dict(config_data)
+        second = IntersectionConfig.from_dict(config_data)
+        
+        assert first.signal_timing is second.signal_timing
+        assert first.detection is second.detection
+        assert first.vehicle_weights['truck'] == 1.5
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.signal_timing.minimum_green = 1
+    
+    def test_default_config_copies_and_serializes(self):
+        """Test configs built from defaults support asdict, deepcopy and JSON."""
+        config = IntersectionConfig.from_dict({'intersection': {'id': 'i1'}})
+        
+        as_dict = dataclasses.asdict(config)
+        assert as_dict['signal_timing']['minimum_green'] == 10
+        assert json.loads(json.dumps(as_dict['vehicle_weights']))['bus'] == 2.0
+        
+        copied = copy.deepcopy(config)
+        assert copied == config
+        assert copied.vehicle_weights is not config.vehicle_weights
+    
     def test_validate_valid_config(self):
         """Test validation of valid configuration."""
         config_data = {
@@ -396,6 +426,28 @@ class TestNetworkConfig:
         assert config.connections[0].from_intersection == 'int1'
         assert config.corridors[0].name == 'Main Corridor'
     
+    def test_intersection_from_network_entry(self):
+        """Test building an intersection directly from a network entry."""
+        int_data = {
+            'video_source': 'test1.mp4',
+            'lanes': {
+                'north': {
+                    'region': [100, 0, 300, 400],
+                    'direction': 'north'
+                }
+            },
+            'signal_timing': {'minimum_green': 15}
+        }
+        
+        config = IntersectionConfig.from_network_entry('int1', int_data)
+        
+        assert config.id == 'int1'
+        assert config.name == 'int1'
+        assert config.video_source == 'test1.mp4'
+        assert 'north' in config.lanes
+        assert config.signal_timing.minimum_green == 15
+        assert config.vehicle_weights == {}
+    
     def test_validate_valid_network_config(self):
         """Test validation of valid network configuration."""
         config_data = {
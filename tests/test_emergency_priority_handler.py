@@ -249,6 +249,18 @@ class TestEmergencyPriorityHandler:
         assert len(history) == 2
         assert history[0] == event1
         assert history[1] == event2
+        
+        # History is a read-only view, not a copy
+        with pytest.raises(TypeError):
+            history[0] = event2
+        assert not hasattr(history, 'append')
+        
+        # The view still compares like the list it wraps
+        assert history == [event1, event2]
+        assert history == (event1, event2)
+        assert history != [event1]
+        assert EmergencyPriorityHandler().get_emergency_history() == []
+        assert "ReadOnlyList" in repr(history)
     
     def test_full_emergency_lifecycle(self):
         """Test complete emergency vehicle lifecycle"""
@@ -4,7 +4,7 @@ Unit tests for EnhancedDetector module.
 import pytest
 import numpy as np
 from src.enhanced_detector import (
-    EnhancedDetector, Detection, DetectionResult, TrackedObject,
+    EnhancedDetector, Detection, DetectionBatch, DetectionResult, TrackedObject,
     VehicleType, SimpleTracker
 )
 
@@ -19,6 +19,12 @@ def test_enhanced_detector_initialization():
     assert detector.tracker is not None, "Tracker should be initialized"
 
 
+def test_enhanced_detector_rejects_unknown_backend():
+    """Test that an unsupported inference backend is rejected up front."""
+    with pytest.raises(ValueError):
+        EnhancedDetector(model_path="yolov8n.pt", backend="tflite")
+
+
 def test_detection_result_structure():
     """Test DetectionResult dataclass structure."""
     vehicles = [Detection(bbox=(10, 10, 50, 50), confidence=0.9, class_id=2, class_name='car')]
@@ -46,6 +52,31 @@ def test_detection_center_calculation():
     assert detection.center == (125, 230), "Center should be calculated correctly"
 
 
+def test_detection_precomputed_center():
+    """Test that a center passed in (e.g. from a DetectionBatch) is kept as is."""
+    detection = Detection(bbox=(100, 200, 50, 60), confidence=0.9, class_id=2, class_name='car', center=(125, 230))
+    
+    assert detection.center == (125, 230), "Given center should be used"
+
+
+def test_detection_batch_view():
+    """Test DetectionBatch builds Detection views from its arrays."""
+    batch = DetectionBatch(
+        bboxes=np.array([[100, 200, 50, 60], [10, 10, 30, 40]]),
+        centers=np.array([[125, 230], [25, 30]]),
+        confidences=np.array([0.9, 0.6], dtype=np.float32),
+        class_ids=np.array([2, 0]),
+        class_names=['car', 'person']
+    )
+    
+    assert len(batch) == 2, "Batch should hold 2 detections"
+    detection = batch.view(0)
+    assert detection.bbox == (100, 200, 50, 60), "View should expose the bbox tuple"
+    assert detection.center == (125, 230), "View center should match the batch center"
+    assert detection.class_name == 'car', "View should carry the class name"
+    assert batch.view(0) is detection, "Views should be cached"
+
+
 def test_classify_vehicle_type_car():
     """Test vehicle type classification for car."""
     detector = EnhancedDetector(model_path="yolov8n.pt", confidence_threshold=0.5)
@@ -118,6 +149,31 @@ def test_is_emergency_vehicle_large_truck():
     assert isinstance(result, bool), "Should return boolean"
 
 
+def test_is_emergency_vehicle_caches_on_detection():
+    """Test that the emergency check is cached on the detection and reused."""
+    detector = EnhancedDetector(model_path="yolov8n.pt", confidence_threshold=0.5)
+    
+    ambulance = Detection(bbox=(10, 10, 50, 50), confidence=0.9, class_id=99, class_name='Ambulance')
+    truck = Detection(bbox=(10, 10, 300, 200), confidence=0.9, class_id=7, class_name='truck')
+    
+    assert detector.is_emergency_vehicle(ambulance), "Emergency class names should match"
+    assert ambulance._is_emergency is True, "Result should be cached on the detection"
+    assert detector.classify_vehicle_type(truck) == VehicleType.EMERGENCY_AMBULANCE
+    assert truck._is_emergency is True, "classify_vehicle_type should populate the cache"
+
+
+def test_class_id_tables():
+    """Test the per-category class id tables built from the model's class names."""
+    detector = EnhancedDetector(model_path="yolov8n.pt", confidence_threshold=0.5)
+    
+    detector._build_class_id_tables({0: 'person', 2: 'car', 7: 'truck', 9: 'ambulance'})
+    
+    assert detector._pedestrian_ids.tolist() == [0]
+    assert detector._vehicle_ids.tolist() == [2, 7]
+    assert detector._emerg_ids.tolist() == [9]
+    assert detector._large_vehicle_ids.tolist() == [7]
+
+
 def test_detect_all_on_black_frame():
     """Test detect_all on a simple black frame."""
     detector = EnhancedDetector(model_path="yolov8n.pt", confidence_threshold=0.5)
@@ -134,6 +190,32 @@ def test_detect_all_on_black_frame():
     assert result.timestamp == 1.0, "Timestamp should be set"
 
 
+def test_detect_all_batch_on_black_frames():
+    """Test detect_all_batch returns one result per frame."""
+    detector = EnhancedDetector(model_path="yolov8n.pt", confidence_threshold=0.5)
+    
+    frames = [np.zeros((480, 640, 3), dtype=np.uint8) for _ in range(3)]
+    
+    results = detector.detect_all_batch(frames, timestamps=[1.0, 2.0, 3.0])
+    
+    assert len(results) == 3, "Should return one result per frame"
+    assert all(isinstance(r, DetectionResult) for r in results), "Should return DetectionResults"
+    assert [r.timestamp for r in results] == [1.0, 2.0, 3.0], "Timestamps should follow input order"
+
+
+def test_detect_all_async_preserves_order():
+    """Test detect_all_async resolves futures with results in submission order."""
+    detector = EnhancedDetector(model_path="yolov8n.pt", confidence_threshold=0.5, enhance_night=True)
+    
+    frames = [np.zeros((480, 640, 3), dtype=np.uint8) for _ in range(3)]
+    futures = [detector.detect_all_async(frame, timestamp=float(i)) for i, frame in enumerate(frames)]
+    results = [future.result(timeout=60) for future in futures]
+    detector.close()
+    
+    assert all(isinstance(r, DetectionResult) for r in results), "Should return DetectionResults"
+    assert [r.timestamp for r in results] == [0.0, 1.0, 2.0], "Results should follow submission order"
+
+
 def test_simple_tracker_initialization():
     """Test SimpleTracker initialization."""
     tracker = SimpleTracker(max_age=30, min_hits=3, iou_threshold=0.3)
@@ -267,3 +349,113 @@ def test_distance_calculation():
     point4 = (3, 4)
     distance = tracker._calculate_distance(point3, point4)
     assert distance == 5.0, "Distance should be 5 (3-4-5 triangle)"
+
+
+def test_cost_matrix_matches_scalar_helpers():
+    """Test vectorized cost matrix agrees with the scalar IoU/distance helpers."""
+    tracker = SimpleTracker()
+    
+    track_boxes = [(100, 100, 50, 50), (300, 300, 40, 60)]
+    det_boxes = [(110, 105, 50, 50), (125, 125, 50, 50), (600, 10, 20, 20)]
+    
+    track_centers = np.array([Detection(b, 0.9, 2, 'car').center for b in track_boxes])
+    det_centers = np.array([Detection(b, 0.9, 2, 'car').center for b in det_boxes])
+    iou, cost = tracker._cost_matrix(
+        tracker._to_xyxy(track_boxes), tracker._to_xyxy(det_boxes), track_centers, det_centers
+    )
+    
+    assert iou.shape == (2, 3), "Should have one row per track and one column per detection"
+    for i, tb in enumerate(track_boxes):
+        for j, db in enumerate(det_boxes):
+            expected_iou = tracker._calculate_iou(tb, db)
+            t = Detection(bbox=tb, confidence=0.9, class_id=2, class_name='car')
+            d = Detection(bbox=db, confidence=0.9, class_id=2, class_name='car')
+            expected_cost = -expected_iou + tracker._calculate_distance(t.center, d.center) / 1000.0
+            assert iou[i, j] == pytest.approx(expected_iou), "IoU should match scalar helper"
+            assert cost[i, j] == pytest.approx(expected_cost), "Cost should match scalar helpers"
+
+
+def test_simple_tracker_optimal_assignment():
+    """Test tracker picks the minimum total-cost assignment, not the greedy one."""
+    tracker = SimpleTracker(max_age=30, min_hits=1, iou_threshold=0.3)
+    
+    tracker.update([
+        Detection(bbox=(0, 0, 20, 20), confidence=0.9, class_id=2, class_name='car'),
+        Detection(bbox=(100, 0, 20, 20), confidence=0.9, class_id=2, class_name='car')
+    ], fps=30.0)
+    
+    # Greedy matching would pair track 1 with the closest detection (x=60)
+    # and leave track 0 with the far one (x=160)
+    near = Detection(bbox=(60, 0, 20, 20), confidence=0.9, class_id=2, class_name='car')
+    far = Detection(bbox=(160, 0, 20, 20), confidence=0.9, class_id=2, class_name='car')
+    matched, unmatched = tracker._match_detections([near, far])
+    
+    assert matched[0] is near, "Track 0 should take the detection 60px away"
+    assert matched[1] is far, "Track 1 should take the detection 60px away"
+    assert unmatched == [], "All detections should be matched"
+
+
+def test_simple_tracker_accepts_detection_batch():
+    """Test tracker updates from a DetectionBatch the same way as from a list."""
+    tracker = SimpleTracker(max_age=30, min_hits=1, iou_threshold=0.3)
+    
+    detection1 = Detection(bbox=(100, 100, 50, 50), confidence=0.9, class_id=2, class_name='car')
+    tracker.update(DetectionBatch.from_detections([detection1]), fps=30.0)
+    
+    detection2 = Detection(bbox=(105, 105, 50, 50), confidence=0.9, class_id=2, class_name='car')
+    tracked = tracker.update(DetectionBatch.from_detections([detection2]), fps=30.0)
+    
+    assert len(tracked) == 1, "Should still have 1 tracked object"
+    assert tracked[0].object_id == 0, "Should maintain same ID"
+    assert tracked[0].detection is detection2, "Batch built from detections should reuse them"
+
+
+def test_scalar_cost_kernel_matches_vectorized():
+    """Test the scalar (JIT) cost kernel agrees with the NumPy cost matrix."""
+    from src.enhanced_detector import _fill_cost_matrix
+    tracker = SimpleTracker()
+    
+    track_boxes = tracker._to_xyxy([(100, 100, 50, 50), (300, 300, 40, 60)])
+    det_boxes = tracker._to_xyxy([(110, 105, 50, 50), (600, 10, 20, 20), (300, 330, 40, 60)])
+    track_centers = (track_boxes[:, :2] + track_boxes[:, 2:]) // 2
+    det_centers = (det_boxes[:, :2] + det_boxes[:, 2:]) // 2
+    
+    iou, cost = tracker._cost_matrix(track_boxes, det_boxes, track_centers, det_centers)
+    jit_iou, jit_cost = np.empty((2, 3), dtype=np.float32), np.empty((2, 3), dtype=np.float32)
+    _fill_cost_matrix(track_boxes, det_boxes, track_centers, det_centers, jit_iou, jit_cost)
+    
+    assert np.allclose(iou, jit_iou), "IoU should match between kernels"
+    assert np.allclose(cost, jit_cost), "Cost should match between kernels"
+
+
+def test_simple_tracker_trajectory_is_bounded():
+    """Test that track trajectories keep only the most recent positions"""
+    tracker = SimpleTracker(min_hits=1)
+    
+    for step in range(SimpleTracker.TRAJECTORY_LENGTH + 10):
+        tracked = tracker.update([Detection((step, 0, 20, 20), 0.9, 2, 'car')])
+    
+    assert len(tracked) == 1
+    assert len(tracked[0].trajectory) == SimpleTracker.TRAJECTORY_LENGTH
+    assert tracked[0].trajectory[-1] == tracked[0].detection.center
+
+
+def test_simple_tracker_trajectory_shares_stable_points():
+    """Test that trajectories are int32 views that later updates leave unchanged"""
+    tracker = SimpleTracker(min_hits=1)
+    length = SimpleTracker.TRAJECTORY_LENGTH
+    snapshots = []
+    
+    for step in range(2 * length + 5):
+        tracked = tracker.update([Detection((step, 2 * step, 20, 20), 0.9, 2, 'car')])
+        snapshots.append((step, tracked[0].trajectory))
+    
+    for step, trajectory in snapshots:
+        expected = [(10 + k, 2 * k + 10) for k in range(max(0, step - length + 1), step + 1)]
+        
+        assert trajectory == expected
+        assert trajectory[-1] == expected[-1]
+        assert trajectory.points.dtype == np.int32
+        assert not trajectory.points.flags.writeable
+    
+    assert tracked[0].velocity == pytest.approx((30.0, 60.0))
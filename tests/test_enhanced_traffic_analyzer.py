@@ -71,6 +71,34 @@ class TestEnhancedTrafficAnalyzer:
         # South: 5 + (20 * 0.5) = 15.0
         assert densities['south'] == pytest.approx(15.0)
     
+    def test_calculate_density_with_partial_queue_metrics(self):
+        """Test that only lanes with queue data change, and unknown lanes are ignored."""
+        analyzer = EnhancedTrafficAnalyzer()
+        
+        queue_metrics = {
+            'north': QueueMetrics(
+                length_meters=10.0,
+                vehicle_count=2,
+                density=0.2,
+                head_position=(100, 100),
+                tail_position=(200, 200),
+                is_spillback=False
+            ),
+            'west': QueueMetrics(
+                length_meters=40.0,
+                vehicle_count=8,
+                density=0.2,
+                head_position=(100, 100),
+                tail_position=(200, 200),
+                is_spillback=False
+            )
+        }
+        
+        densities = analyzer.calculate_density({'north': 2, 'south': 4}, queue_metrics)
+        
+        assert densities == {'north': pytest.approx(7.0), 'south': 4.0}
+        assert analyzer.calculate_density({'north': 2}, {}) == {'north': 2.0}
+    
     def test_calculate_weighted_priority_basic(self):
         """Test weighted priority calculation with basic lane data."""
         analyzer = EnhancedTrafficAnalyzer()
@@ -123,6 +151,84 @@ class TestEnhancedTrafficAnalyzer:
         assert priority_buses > priority_cars
         assert priority_buses == pytest.approx(priority_cars * 2.0)
     
+    def test_calculate_weighted_priority_ignores_zero_count_types(self):
+        """Test that empty vehicle type buckets do not change the type weight."""
+        analyzer = EnhancedTrafficAnalyzer()
+        
+        lane_sparse = LaneData(
+            vehicle_count=4,
+            queue_length=0.0,
+            wait_time=0.0,
+            vehicle_types={VehicleType.CAR: 4, VehicleType.BUS: 0, VehicleType.TRUCK: 0},
+            has_emergency=False,
+            pedestrian_count=0
+        )
+        lane_mixed = LaneData(
+            vehicle_count=4,
+            queue_length=0.0,
+            wait_time=0.0,
+            vehicle_types={VehicleType.CAR: 2, VehicleType.BUS: 2, VehicleType.TRUCK: 0},
+            has_emergency=False,
+            pedestrian_count=0
+        )
+        
+        assert analyzer.calculate_weighted_priority(lane_sparse) == pytest.approx(4.0)
+        assert analyzer.calculate_weighted_priority(lane_mixed) == pytest.approx(4.0 * 1.5)
+    
+    def test_calculate_weighted_priority_with_string_type_keys(self):
+        """Test that type name strings (as built by main.py) get their type's weight."""
+        analyzer = EnhancedTrafficAnalyzer()
+        
+        lane_mixed = LaneData(
+            vehicle_count=3,
+            queue_length=0.0,
+            wait_time=0.0,
+            vehicle_types={'car': 2, 'bus': 1},
+            has_emergency=False,
+            pedestrian_count=0
+        )
+        lane_single = LaneData(
+            vehicle_count=3,
+            queue_length=0.0,
+            wait_time=0.0,
+            vehicle_types={'bus': 3},
+            has_emergency=False,
+            pedestrian_count=0
+        )
+        
+        lane_unknown = LaneData(
+            vehicle_count=3,
+            queue_length=0.0,
+            wait_time=0.0,
+            vehicle_types={'tram': 2, 'car': 1},
+            has_emergency=False,
+            pedestrian_count=0
+        )
+        
+        # (2 * 1.0 + 1 * 2.0) / 3 weighted average, times 3 vehicles
+        assert analyzer.calculate_weighted_priority(lane_mixed) == pytest.approx(4.0)
+        assert analyzer.calculate_weighted_priority(lane_single) == pytest.approx(6.0)
+        # Unknown names fall back to weight 1.0
+        assert analyzer.calculate_weighted_priority(lane_unknown) == pytest.approx(3.0)
+    
+    def test_lane_data_and_snapshot_are_slotted(self):
+        """Test that the per-lane record types carry no instance __dict__."""
+        lane_data = LaneData(
+            vehicle_count=1,
+            queue_length=0.0,
+            wait_time=0.0,
+            vehicle_types={VehicleType.CAR: 1},
+            has_emergency=False,
+            pedestrian_count=0
+        )
+        snapshot = DensitySnapshot(timestamp=0.0, lane='north', density=1.0,
+                                   vehicle_count=1, queue_length=0.0)
+        
+        assert not hasattr(lane_data, '__dict__')
+        assert not hasattr(snapshot, '__dict__')
+        assert lane_data.vehicle_types == {VehicleType.CAR: 1}
+        assert snapshot == DensitySnapshot(0.0, 'north', 1.0, 1, 0.0)
+    
     def test_calculate_weighted_priority_with_emergency(self):
         """Test that emergency vehicles dramatically increase priority."""
         analyzer = EnhancedTrafficAnalyzer()
@@ -179,6 +285,29 @@ class TestEnhancedTrafficAnalyzer:
         # With pedestrians should be higher
         assert priority_with_peds > priority_no_peds
     
+    def test_calculate_weighted_priority_batch_matches_scalar(self):
+        """Test that batch scoring agrees with calculate_weighted_priority per lane."""
+        analyzer = EnhancedTrafficAnalyzer()
+        vehicle_types = list(VehicleType)
+        
+        lanes = [
+            LaneData(10, 30.0, 20.0, {VehicleType.CAR: 8, VehicleType.BUS: 2}, False, 0),
+            LaneData(3, 0.0, 5.0, {VehicleType.TRUCK: 3}, True, 4),
+            LaneData(0, 0.0, 0.0, {}, False, 15),
+        ]
+        
+        priorities = analyzer.calculate_weighted_priority_batch(
+            counts=[lane.vehicle_count for lane in lanes],
+            queues=[lane.queue_length for lane in lanes],
+            waits=[lane.wait_time for lane in lanes],
+            type_counts=[[lane.vehicle_types.get(vt, 0) for vt in vehicle_types] for lane in lanes],
+            has_emergency=[lane.has_emergency for lane in lanes],
+            pedestrian_counts=[lane.pedestrian_count for lane in lanes]
+        )
+        
+        expected = [analyzer.calculate_weighted_priority(lane) for lane in lanes]
+        assert priorities.tolist() == pytest.approx(expected)
+    
     def test_detect_congestion_trend_insufficient_data(self):
         """Test trend detection with insufficient historical data."""
         analyzer = EnhancedTrafficAnalyzer()
@@ -230,6 +359,48 @@ class TestEnhancedTrafficAnalyzer:
         trend = analyzer.detect_congestion_trend('north', 15.0, 15, 45.0)
         assert trend == CongestionTrend.STABLE
     
+    def test_detect_congestion_trend_after_window_wraps(self):
+        """Test that only the most recent TREND_WINDOW_SIZE samples drive the trend."""
+        analyzer = EnhancedTrafficAnalyzer()
+        
+        # Long worsening run, then a full window of flat samples
+        for i in range(25):
+            analyzer.detect_congestion_trend('north', 10.0 + i * 2.0, 10, 30.0)
+        window_size = analyzer.TREND_WINDOW_SIZE
+        window = analyzer.density_history['north']
+        retained = [10.0 + i * 2.0 for i in range(25 - window_size, 25)]
+        assert window.total == 25
+        assert [window.ring[k % window_size] for k in range(25 - window_size, 25)] == retained
+        assert window.older_sum == pytest.approx(sum(retained[:window_size // 2]))
+        assert window.recent_sum == pytest.approx(sum(retained[window_size // 2:]))
+        for _ in range(analyzer.TREND_WINDOW_SIZE - 1):
+            analyzer.detect_congestion_trend('north', 20.0, 20, 60.0)
+        
+        trend = analyzer.detect_congestion_trend('north', 20.0, 20, 60.0)
+        assert trend == CongestionTrend.STABLE
+        
+        assert len(analyzer.density_history['north']) == analyzer.TREND_WINDOW_SIZE
+        
+        # After a reset the lane needs fresh history again
+        analyzer.reset_history('north')
+        assert analyzer.detect_congestion_trend('north', 50.0, 50, 150.0) == CongestionTrend.STABLE
+        assert analyzer.detect_congestion_trend('north', 5.0, 5, 15.0) == CongestionTrend.STABLE
+    
+    def test_detect_congestion_trend_empty_older_window(self):
+        """Test that an older half of empty-lane samples reads as no trend after sliding."""
+        analyzer = EnhancedTrafficAnalyzer()
+        
+        # Non-integer densities that leave rounding residue in running sums
+        for density in [0.1, 0.2, 0.7, 0.3]:
+            analyzer.detect_congestion_trend('north', density, 1, 0.0)
+        for _ in range(analyzer.TREND_WINDOW_SIZE // 2):
+            analyzer.detect_congestion_trend('north', 0.0, 0, 0.0)
+        for _ in range(analyzer.TREND_WINDOW_SIZE // 2 - 1):
+            analyzer.detect_congestion_trend('north', 3.0, 3, 0.0)
+        
+        trend = analyzer.detect_congestion_trend('north', 3.0, 3, 0.0)
+        assert trend == CongestionTrend.STABLE
+    
     def test_calculate_throughput_empty(self):
         """Test throughput calculation with no data."""
         analyzer = EnhancedTrafficAnalyzer()
@@ -252,6 +423,57 @@ class TestEnhancedTrafficAnalyzer:
         # Should be 10 vehicles/second = 36000 vehicles/hour
         assert throughput == pytest.approx(36000.0, rel=0.1)
     
+    def test_calculate_throughput_evicts_expired(self):
+        """Test that expired clearances are dropped, including ones recorded out of order."""
+        analyzer = EnhancedTrafficAnalyzer()
+        
+        current_time = time.time()
+        analyzer.record_vehicle_cleared('north', current_time - 0.5)
+        analyzer.record_vehicle_cleared('north', current_time - 5.0)  # Late report, already expired
+        analyzer.record_vehicle_cleared('north', current_time - 0.2)
+        
+        throughput = analyzer.calculate_throughput('north', time_window=1.0)
+        
+        assert throughput == pytest.approx(7200.0, rel=0.1)
+        assert list(analyzer.throughput_data['north']) == [current_time - 0.5, current_time - 0.2]
+    
+    def test_tick_time_is_shared_within_a_tick(self):
+        """Test that clearances and throughput use the tick time until the next tick."""
+        analyzer = EnhancedTrafficAnalyzer()
+        
+        analyzer.tick(1000.0)
+        analyzer.record_vehicle_cleared('north')
+        analyzer.record_vehicle_cleared('north', 999.5)
+        
+        assert list(analyzer.throughput_data['north']) == [999.5, 1000.0]
+        assert analyzer.calculate_throughput('north', time_window=1.0) == pytest.approx(7200.0)
+        
+        # Next tick: both clearances have left the 1 second window
+        analyzer.tick(1002.0)
+        assert analyzer.get_throughput_summary(time_window=1.0) == {'north': 0.0}
+    
+    def test_update_lane_matches_separate_calls(self):
+        """Test that the fused lane update agrees with the individual methods."""
+        fused = EnhancedTrafficAnalyzer()
+        separate = EnhancedTrafficAnalyzer()
+        
+        for step, density in enumerate([10.0, 12.0, 15.0, 19.0, 24.0]):
+            fused.tick(1000.0 + step)
+            separate.tick(1000.0 + step)
+            
+            trend, throughput = fused.update_lane('north', density, int(density), density * 3, cleared=2,
+                                                  time_window=3.0)
+            
+            expected_trend = separate.detect_congestion_trend('north', density, int(density), density * 3)
+            separate.record_vehicle_cleared('north')
+            separate.record_vehicle_cleared('north')
+            
+            assert trend == expected_trend
+            assert throughput == separate.calculate_throughput('north', time_window=3.0)
+        
+        assert trend == CongestionTrend.WORSENING
+        assert fused.throughput_data['north'] == separate.throughput_data['north']
+    
     def test_record_vehicle_cleared(self):
         """Test recording vehicle clearances."""
         analyzer = EnhancedTrafficAnalyzer()
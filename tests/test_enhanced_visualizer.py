@@ -0,0 +1,256 @@
+"""
+Unit tests for EnhancedVisualizer module.
+"""
+import math
+
+import cv2
+import numpy as np
+import pytest
+
+from src.enhanced_detector import Detection, DetectionResult, TrackedObject
+from src.enhanced_visualizer import EnhancedVisualizer
+from src.models import Frame, SignalState, SignalPhase, PhaseType
+from src.queue_estimator import QueueMetrics
+
+
+def make_frame(seed: int = 0, height: int = 480, width: int = 640) -> Frame:
+    """Create a frame of random pixels."""
+    image = np.random.RandomState(seed).randint(0, 256, (height, width, 3), dtype=np.uint8)
+    return Frame(image=image, frame_number=seed, timestamp=seed * 0.1)
+
+
+def max_difference(a: np.ndarray, b: np.ndarray) -> int:
+    """Largest per-channel difference between two images."""
+    return int(np.abs(a.astype(np.int16) - b.astype(np.int16)).max())
+
+
+def reference_grid_layout(frames, width, height):
+    """Grid layout built one cell at a time on a blank canvas."""
+    cols = int(np.ceil(np.sqrt(len(frames))))
+    rows = int(np.ceil(len(frames) / cols))
+    cell_width = width // cols
+    cell_height = height // rows
+
+    canvas = np.zeros((rows * cell_height, cols * cell_width, 3), dtype=np.uint8)
+    for idx, frame in enumerate(frames):
+        y = (idx // cols) * cell_height
+        x = (idx % cols) * cell_width
+        canvas[y:y + cell_height, x:x + cell_width] = cv2.resize(frame.image, (cell_width, cell_height))
+    return canvas
+
+
+def reference_layout(frames, layout):
+    """Split-view layouts built from separately resized frames."""
+    height, width = frames[0].image.shape[:2]
+
+    if layout == "horizontal":
+        new_width = width // len(frames)
+        return np.hstack([cv2.resize(frame.image, (new_width, height)) for frame in frames])
+    if layout == "vertical":
+        new_height = height // len(frames)
+        return np.vstack([cv2.resize(frame.image, (width, new_height)) for frame in frames])
+    if layout == "grid":
+        return reference_grid_layout(frames, width, height)
+
+    # Picture-in-picture
+    canvas = frames[0].image.copy()
+    pip_width = width // 4
+    pip_height = height // 4
+    for idx, frame in enumerate(frames[1:], start=1):
+        x_pos = width - pip_width - 10
+        y_pos = height - (idx * (pip_height + 10))
+        if y_pos < 0:
+            break
+        canvas[y_pos:y_pos + pip_height, x_pos:x_pos + pip_width] = cv2.resize(frame.image, (pip_width, pip_height))
+        cv2.rectangle(canvas, (x_pos, y_pos), (x_pos + pip_width, y_pos + pip_height), (255, 255, 255), 2)
+    return canvas
+
+
+def reference_overlay(image, top_left, bottom_right, color, alpha):
+    """Blend a filled rectangle over a whole-frame copy, as a full overlay would."""
+    overlay = image.copy()
+    cv2.rectangle(overlay, top_left, bottom_right, color, -1)
+    return cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0)
+
+
+class TestEnhancedVisualizer:
+    """Unit tests for EnhancedVisualizer class."""
+
+    def test_heatmap_matches_reference_blend(self):
+        """Test that the heatmap equals a smoothed full-frame heatmap blended with addWeighted."""
+        visualizer = EnhancedVisualizer()
+        height, width = 480, 640
+        accumulator = np.zeros((height, width, 3), dtype=np.float32)
+
+        densities = [
+            {'north': 0.1, 'south': 0.9, 'east': 0.4},
+            {'north': 0.6, 'west': 0.3},
+            {'NORTH': 0.8, 'south': 0.2, 'east': 0.9, 'west': 0.55},
+            {},
+            {'south': 0.3, 'unknown': 1.0}
+        ]
+        for step, density_data in enumerate(densities):
+            frame = make_frame(step, height, width)
+
+            # Reference: paint each lane quadrant, smooth the whole frame, blend
+            current = np.zeros_like(accumulator)
+            for lane, density in density_data.items():
+                region = visualizer._get_lane_region(lane, width, height)
+                if region:
+                    x, y, w, h = region
+                    current[y:y + h, x:x + w] = visualizer._get_heatmap_color(density)
+            accumulator = visualizer.heatmap_alpha * current + (1 - visualizer.heatmap_alpha) * accumulator
+            expected = cv2.addWeighted(frame.image, 0.7, accumulator.astype(np.uint8), 0.3, 0)
+
+            result = visualizer.draw_heatmap(frame, density_data)
+
+            assert result.image.shape == expected.shape
+            assert max_difference(result.image, expected) <= 1
+
+    def test_heatmap_disabled_returns_input(self):
+        """Test that a disabled heatmap leaves the frame untouched."""
+        visualizer = EnhancedVisualizer(enable_heatmap=False)
+        frame = make_frame()
+
+        assert visualizer.draw_heatmap(frame, {'north': 1.0}) is frame
+
+    def test_inplace_matches_copy(self):
+        """Test that inplace drawing gives the copy's pixels and that copies leave the input alone."""
+        result = DetectionResult(
+            vehicles=[Detection((50, 60, 40, 30), 0.91, 2, 'car')],
+            pedestrians=[Detection((300, 200, 20, 50), 0.77, 0, 'person')],
+            emergency_vehicles=[Detection((400, 100, 60, 40), 0.88, 7, 'ambulance')],
+            timestamp=0.0
+        )
+        tracked = [TrackedObject(1, result.vehicles[0], [(10, 10), (40, 30), (80, 60)], (5.0, 2.0), 3)]
+        queues = {
+            'north': QueueMetrics(25.0, 4, 0.3, (100, 100), (100, 300), True),
+            'east': QueueMetrics(10.0, 2, 0.2, (500, 100), (400, 100), False)
+        }
+        states = {'north': SignalState.GREEN, 'south': SignalState.RED}
+        phases = [SignalPhase(phase_type=PhaseType.THROUGH, lanes=['north'], duration=30, state=SignalState.GREEN)]
+        metrics = {'fps': 29.7, 'frame_count': 12, 'mode': 'adaptive'}
+
+        draws = {
+            'detections': lambda v, f, inplace: v.draw_detections_enhanced(f, result, inplace=inplace),
+            'heatmap': lambda v, f, inplace: v.draw_heatmap(f, {'north': 0.9, 'west': 0.2}, inplace=inplace),
+            'trajectories': lambda v, f, inplace: v.draw_trajectories(f, tracked, inplace=inplace),
+            'queues': lambda v, f, inplace: v.draw_queue_visualization(f, queues, inplace=inplace),
+            'signal_panel': lambda v, f, inplace: v.draw_signal_panel(f, states, phases, {'north': 12.0}, inplace=inplace),
+            'metrics': lambda v, f, inplace: v.draw_metrics_overlay(f, metrics, inplace=inplace)
+        }
+        for name, draw in draws.items():
+            frame = make_frame(1)
+            original = frame.image.copy()
+
+            copied = draw(EnhancedVisualizer(), frame, False)
+            assert copied is not frame, name
+            assert np.array_equal(frame.image, original), name
+            assert (copied.frame_number, copied.timestamp) == (frame.frame_number, frame.timestamp), name
+
+            drawn = draw(EnhancedVisualizer(), frame, True)
+            assert drawn is frame, name
+            assert np.array_equal(frame.image, copied.image), name
+
+    @pytest.mark.parametrize("layout", ["grid", "horizontal", "vertical", "pip"])
+    @pytest.mark.parametrize("num_frames", [2, 3, 5])
+    def test_split_view_matches_reference(self, layout, num_frames):
+        """Test each split-view layout against frames resized and placed one at a time."""
+        visualizer = EnhancedVisualizer()
+        frames = [make_frame(seed) for seed in range(num_frames)]
+
+        combined = visualizer.create_split_view(frames, layout)
+
+        assert np.array_equal(combined.image, reference_layout(frames, layout))
+        assert combined.frame_number == frames[0].frame_number
+        assert combined.timestamp == frames[0].timestamp
+
+    def test_grid_layouts_do_not_share_the_cell_buffer(self):
+        """Test that a later grid layout does not change an earlier result."""
+        visualizer = EnhancedVisualizer()
+        first_frames = [make_frame(seed) for seed in range(3)]
+        second_frames = [make_frame(seed) for seed in range(10, 14)]
+
+        first = visualizer.create_split_view(first_frames, "grid")
+        visualizer.create_split_view(second_frames, "grid")
+        third = visualizer.create_split_view(first_frames[:2] + [make_frame(20)], "grid")
+
+        assert np.array_equal(first.image, reference_layout(first_frames, "grid"))
+        # The unused fourth cell is blank again after a fuller grid
+        assert not third.image[240:, 320:].any()
+
+    def test_signal_panel_matches_full_overlay(self):
+        """Test that blending only the panel rows matches the full-frame overlay blend."""
+        visualizer = EnhancedVisualizer()
+        frame = make_frame(2)
+        height, width = frame.image.shape[:2]
+
+        # No lanes: the panel background and title only
+        result = visualizer.draw_signal_panel(frame, {}, [])
+        expected = reference_overlay(frame.image, (0, height - 180), (width, height), (40, 40, 40), 0.75)
+        cv2.putText(expected, "Signal Status", (10, height - 155), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+        assert max_difference(result.image, expected) <= 1
+        assert np.array_equal(result.image[:height - 180], frame.image[:height - 180])
+
+    def test_metrics_overlay_matches_full_overlay(self):
+        """Test that blending only the metrics box matches the full-frame overlay blend."""
+        visualizer = EnhancedVisualizer()
+        frame = make_frame(3)
+        height, width = frame.image.shape[:2]
+
+        # No metrics: the background box and title only
+        result = visualizer.draw_metrics_overlay(frame, {})
+        expected = reference_overlay(frame.image, (width - 310, 10), (width - 10, height - 190), (30, 30, 30), 0.7)
+        cv2.putText(expected, "System Metrics", (width - 290, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+        assert max_difference(result.image, expected) <= 1
+        assert np.array_equal(result.image[:, :width - 310], frame.image[:, :width - 310])
+
+    def test_metric_text_follows_value_changes(self):
+        """Test that cached metric lines are rebuilt whenever the value changes."""
+        visualizer = EnhancedVisualizer()
+
+        assert visualizer._metric_text('avg_wait_time', 12.5) == "Avg Wait Time: 12.50"
+        assert visualizer._metric_text('avg_wait_time', 12.5) == "Avg Wait Time: 12.50"
+        assert visualizer._metric_text('avg_wait_time', 13.25) == "Avg Wait Time: 13.25"
+
+        # Equal values of different types format differently
+        assert visualizer._metric_text('count', 1) == "Count: 1"
+        assert visualizer._metric_text('count', 1.0) == "Count: 1.00"
+        assert visualizer._metric_text('count', True) == "Count: True"
+
+        # Mutable values are formatted afresh every time
+        lanes = ['north']
+        assert visualizer._metric_text('lanes', lanes) == "Lanes: ['north']"
+        lanes.append('south')
+        assert visualizer._metric_text('lanes', lanes) == "Lanes: ['north', 'south']"
+
+    def test_metrics_overlay_redraws_changed_values(self):
+        """Test that the overlay shows the current value after a change."""
+        visualizer = EnhancedVisualizer()
+        frame = make_frame(4)
+
+        first = visualizer.draw_metrics_overlay(frame, {'fps': 30.0})
+        second = visualizer.draw_metrics_overlay(frame, {'fps': 12.0})
+        fresh = EnhancedVisualizer().draw_metrics_overlay(frame, {'fps': 12.0})
+
+        assert not np.array_equal(first.image, second.image)
+        assert np.array_equal(second.image, fresh.image)
+
+    def test_trajectory_points_accept_lists_and_tracker_trajectories(self):
+        """Test that list trajectories and tracker trajectories draw the same."""
+        from src.enhanced_detector import Trajectory
+
+        visualizer = EnhancedVisualizer()
+        frame = make_frame(5)
+        detection = Detection((80, 60, 20, 20), 0.9, 2, 'car')
+        positions = [(10, 10), (30, 25), (60, 40), (90, 70)]
+
+        from_list = visualizer.draw_trajectories(frame, [TrackedObject(1, detection, positions, (1.0, 1.0), 4)])
+        from_array = visualizer.draw_trajectories(
+            frame, [TrackedObject(1, detection, Trajectory(np.array(positions, dtype=np.int32)), (1.0, 1.0), 4)]
+        )
+
+        assert np.array_equal(from_list.image, from_array.image)
+        assert not np.array_equal(from_list.image, frame.image)
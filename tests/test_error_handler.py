@@ -39,6 +39,27 @@ class TestErrorHandler:
                 h.close()
                 handler.logger.removeHandler(h)
     
+    def test_log_file_written_by_shutdown(self):
+        """Test that queued log records reach the log file by shutdown"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test_error.log"
+            handler = ErrorHandler(log_file=str(log_file))
+            handler.log_error(ErrorContext(
+                component="TestComponent",
+                operation="test_operation",
+                error_type="TestError",
+                message="Queued message",
+                severity=ErrorSeverity.WARNING,
+                timestamp=time.time()
+            ))
+            handler.shutdown()
+            handler.shutdown()  # Safe to call twice
+            
+            contents = log_file.read_text()
+        
+        assert "[TestComponent] test_operation: Queued message" in contents
+        assert "Shutting down error handler" in contents
+    
     def test_log_error(self):
         """Test error logging"""
         handler = ErrorHandler()
@@ -60,6 +81,19 @@ class TestErrorHandler:
         
         handler.shutdown()
     
+    def test_error_context_is_slotted(self):
+        """Test ErrorContext defaults and that it carries no instance __dict__"""
+        context = ErrorContext("C", "op", "ValueError", "bad", ErrorSeverity.WARNING, 1.0)
+        
+        assert not hasattr(context, '__dict__')
+        assert context.traceback_str is None
+        assert context.recovery_attempted is False
+        assert context.recovery_successful is False
+        assert context == ErrorContext("C", "op", "ValueError", "bad", ErrorSeverity.WARNING, 1.0)
+        
+        context.recovery_attempted = True
+        assert context != ErrorContext("C", "op", "ValueError", "bad", ErrorSeverity.WARNING, 1.0)
+    
     def test_handle_exception(self):
         """Test exception handling"""
         handler = ErrorHandler()
@@ -79,6 +113,37 @@ class TestErrorHandler:
         
         handler.shutdown()
     
+    def test_traceback_captured_only_for_debug_output(self, monkeypatch):
+        """Test that tracebacks are formatted only when a handler emits DEBUG records"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            handler = ErrorHandler()
+            # Keep pytest's capture handlers on the root logger out of the check
+            monkeypatch.setattr(handler.logger, 'propagate', False)
+            
+            try:
+                raise ValueError("Console only")
+            except ValueError as e:
+                handler.handle_exception("TestComponent", "test_operation", e)
+            console_only = handler.error_history[-1]
+            
+            # The file handler logs at DEBUG, so tracebacks are kept from now on
+            file_handler = ErrorHandler(log_file=str(Path(tmpdir) / "test_error.log"))
+            try:
+                raise ValueError("With log file")
+            except ValueError as e:
+                file_handler.handle_exception("TestComponent", "test_operation", e)
+            with_file = file_handler.error_history[-1]
+            
+            handler.shutdown()
+            file_handler.shutdown()
+            for h in file_handler.logger.handlers[:]:
+                h.close()
+                file_handler.logger.removeHandler(h)
+        
+        assert console_only.traceback_str is None
+        assert "ValueError: With log file" in with_file.traceback_str
+        assert 'raise ValueError("With log file")' in with_file.traceback_str
+    
     def test_recovery_strategy(self):
         """Test recovery strategy registration and execution"""
         handler = ErrorHandler()
@@ -164,6 +229,52 @@ class TestErrorHandler:
         
         handler.shutdown()
     
+    def test_error_history_is_bounded(self):
+        """Test that error history keeps only the most recent entries"""
+        handler = ErrorHandler()
+        
+        for i in range(handler.max_history + 5):
+            handler.log_error(ErrorContext(
+                component="TestComponent",
+                operation="test_operation",
+                error_type="TestError",
+                message=f"Error {i}",
+                severity=ErrorSeverity.INFO,
+                timestamp=0.0
+            ))
+        
+        assert len(handler.error_history) == handler.max_history
+        assert handler.error_history[0].message == "Error 5"
+        assert handler.error_history[-1].message == f"Error {handler.max_history + 4}"
+        assert handler.error_counts["TestComponent:TestError"] == handler.max_history + 5
+        
+        handler.shutdown()
+    
+    def test_recent_errors_exclude_old_timestamps(self, monkeypatch):
+        """Test that errors older than the rate window leave the recent count"""
+        handler = ErrorHandler()
+        now = time.time()
+        
+        for timestamp in (now - 2 * handler.ERROR_RATE_WINDOW, now - 10.0, now):
+            handler.log_error(ErrorContext(
+                component="TestComponent",
+                operation="test_operation",
+                error_type="TestError",
+                message="Error",
+                severity=ErrorSeverity.INFO,
+                timestamp=timestamp
+            ))
+        
+        assert handler.get_error_summary()['recent_errors'] == 2
+        
+        # Age the window past the second error
+        monkeypatch.setattr(time, 'time', lambda: now + handler.ERROR_RATE_WINDOW - 5.0)
+        summary = handler.get_error_summary()
+        assert summary['recent_errors'] == 1
+        assert summary['total_errors'] == 3
+        
+        handler.shutdown()
+    
     def test_resource_monitoring_start_stop(self):
         """Test resource monitoring start and stop"""
         handler = ErrorHandler()
@@ -187,6 +298,48 @@ class TestErrorHandler:
         
         handler.shutdown()
     
+    def test_resource_monitoring_stops_promptly(self):
+        """Test that stopping does not wait out the monitoring interval"""
+        handler = ErrorHandler()
+        handler.start_resource_monitoring(interval=30.0)
+        
+        start = time.time()
+        handler.stop_resource_monitoring()
+        
+        assert time.time() - start < 2.0
+        assert not handler.monitor_thread.is_alive()
+        
+        handler.shutdown()
+    
+    def test_first_sample_arrives_before_the_interval(self):
+        """Test that the first sample does not wait out a long monitoring interval"""
+        handler = ErrorHandler()
+        handler.start_resource_monitoring(interval=30.0)
+        
+        time.sleep(handler.MONITOR_FIRST_SAMPLE_DELAY + 1.0)
+        
+        assert handler.get_resource_metrics() is not None
+        assert len(handler.resource_metrics) == 1
+        
+        handler.shutdown()
+    
+    def test_monitor_interval_backoff(self):
+        """Test that quiet samples stretch the monitoring interval and busy ones reset it"""
+        handler = ErrorHandler()
+        
+        interval, quiet = 5.0, 0
+        intervals = []
+        for _ in range(8):
+            interval, quiet = handler._next_monitor_interval(5.0, interval, quiet, 10.0, 20.0)
+            intervals.append(interval)
+        
+        assert intervals == [5.0, 5.0, 5.0, 10.0, 20.0, 40.0, 60.0, 60.0]
+        
+        # A busy sample returns to the configured interval
+        assert handler._next_monitor_interval(5.0, interval, quiet, 70.0, 20.0) == (5.0, 0)
+        
+        handler.shutdown()
+    
     def test_should_throttle(self):
         """Test throttling check"""
         handler = ErrorHandler()
@@ -253,6 +406,42 @@ class TestErrorHandler:
         
         handler.shutdown()
     
+    def test_with_error_handling_decorator_retry(self):
+        """Test that the decorator re-calls a recovered function only when asked to"""
+        handler = ErrorHandler()
+        handler.register_recovery_strategy("test_recovery", lambda exception: None)
+        calls = []
+        
+        def flaky_function():
+            calls.append(True)
+            if len(calls) == 1:
+                raise ValueError("Test error")
+            return "retried"
+        
+        no_retry = with_error_handling(
+            component="TestComponent",
+            operation="test_function",
+            error_handler=handler,
+            recovery_strategy="test_recovery",
+            default_return="default"
+        )(flaky_function)
+        assert no_retry() == "default"
+        assert len(calls) == 1
+        
+        calls.clear()
+        with_retry = with_error_handling(
+            component="TestComponent",
+            operation="test_function",
+            error_handler=handler,
+            recovery_strategy="test_recovery",
+            default_return="default",
+            retry=True
+        )(flaky_function)
+        assert with_retry() == "retried"
+        assert len(calls) == 2
+        
+        handler.shutdown()
+    
     def test_with_error_handling_decorator_success(self):
         """Test error handling decorator with successful function"""
         handler = ErrorHandler()
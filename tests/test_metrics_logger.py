@@ -2,6 +2,7 @@
 Unit tests for MetricsLogger module.
 """
 import json
+import math
 import tempfile
 from pathlib import Path
 import pytest
@@ -293,7 +294,86 @@ class TestMetricsLogger:
         
         finally:
             Path(output_path).unlink(missing_ok=True)
-
+    
+    def test_copy_inputs(self):
+        """Test that logged dicts are stored as passed unless copies are requested."""
+        densities = {'north': 1.0}
+        
+        logger = MetricsLogger("unused.json")
+        logger.log_density(0.0, densities)
+        assert logger._density_logs[0]['densities'] is densities
+        
+        copying_logger = MetricsLogger("unused.json", copy_inputs=True)
+        copying_logger.log_density(0.0, densities)
+        densities['north'] = 2.0
+        assert copying_logger._density_logs[0]['densities'] == {'north': 1.0}
+    
+    def test_output_matches_without_orjson(self, monkeypatch):
+        """Test that the standard json fallback writes the same data as orjson."""
+        import src.metrics_logger as metrics_logger_module
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outputs = []
+            for use_orjson in (metrics_logger_module.ORJSON_AVAILABLE, False):
+                monkeypatch.setattr(metrics_logger_module, 'ORJSON_AVAILABLE', use_orjson)
+                output_path = Path(tmpdir) / f"metrics_{use_orjson}.json"
+                
+                logger = MetricsLogger(str(output_path))
+                logger.log_density(0.0, {'north': 0.125, 'south': 1e-05})
+                logger.log_signal_allocation(1.0, {'north': 20, 'south': 15})
+                logger.log_state_transition(2.0, 'north', SignalState.RED, SignalState.GREEN)
+                logger.finalize()
+                
+                with open(output_path, 'r') as f:
+                    outputs.append(json.load(f))
+                
+                # NaN must survive as NaN rather than turning into null
+                nan_path = Path(tmpdir) / f"metrics_nan_{use_orjson}.json"
+                nan_logger = MetricsLogger(str(nan_path))
+                nan_logger.log_density(0.0, {'north': float('nan'), 'south': 2.5})
+                nan_logger.finalize()
+                
+                with open(nan_path, 'r') as f:
+                    densities = json.load(f)['density_logs'][0]['densities']
+                assert math.isnan(densities['north'])
+                assert densities['south'] == 2.5
+        
+        assert outputs[0] == outputs[1]
+    
+    def test_streamed_output_matches_single_encode(self, monkeypatch):
+        """Test that batched orjson output equals encoding the whole document at once."""
+        import src.metrics_logger as metrics_logger_module
+        if not metrics_logger_module.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        import orjson
+        
+        monkeypatch.setattr(metrics_logger_module, 'LOG_ENTRIES_PER_WRITE', 2)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "metrics.json"
+            logger = MetricsLogger(str(output_path))
+            for i in range(5):
+                logger.log_density(float(i), {'north': i * 0.5, 'south': 1.0})
+            logger.log_signal_allocation(1.0, {'north': 20, 'south': 15})
+            logger.finalize()
+            
+            data = json.loads(output_path.read_bytes())
+            assert output_path.read_bytes() == orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            assert len(data['density_logs']) == 5
+            assert data['transition_logs'] == []
+    
+    def test_any_non_finite(self):
+        """Test the per-log NaN and infinity check on sums that overflow or cannot be taken."""
+        from src.metrics_logger import _any_non_finite
+        
+        assert not _any_non_finite([0.5, 2, True])
+        assert _any_non_finite([0.5, float('nan')])
+        assert _any_non_finite([float('inf'), float('-inf')])
+        # Finite values whose sum overflows
+        assert not _any_non_finite([1e308, 1e308])
+        assert not _any_non_finite([10 ** 400, 1.0])
+        # Non-numeric values
+        assert not _any_non_finite(['north', None, 1.5])
+        assert _any_non_finite(['north', float('nan')])
 
 
 class TestEnhancedMetricsLogger:
@@ -351,6 +431,30 @@ class TestEnhancedMetricsLogger:
         finally:
             Path(output_path).unlink(missing_ok=True)
     
+    def test_detection_result_logging_partial_result(self):
+        """Test that results missing collections or class names are tolerated."""
+        from types import SimpleNamespace
+        from src.metrics_logger import EnhancedMetricsLogger
+        
+        logger = EnhancedMetricsLogger('unused.json')
+        
+        # Result without pedestrians/emergency_vehicles; one vehicle has no class name
+        result = SimpleNamespace(vehicles=[
+            SimpleNamespace(class_name='car'),
+            SimpleNamespace(),
+            SimpleNamespace(class_name='car')
+        ])
+        logger.log_detection_result(2.0, result)
+        logger.log_detection_result(3.0, SimpleNamespace())
+        
+        first, second = logger._detection_logs
+        assert first['vehicle_count'] == 3
+        assert first['pedestrian_count'] == 0
+        assert first['emergency_vehicle_count'] == 0
+        assert first['vehicle_types'] == {'car': 2}
+        assert second['vehicle_count'] == 0
+        assert 'vehicle_types' not in second
+    
     def test_queue_metrics_logging(self):
         """Test that queue metrics are logged correctly."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
@@ -778,3 +882,42 @@ class TestEnhancedMetricsLogger:
         
         finally:
             Path(output_path).unlink(missing_ok=True)
+    
+    def test_non_finite_values_are_flagged_when_logged(self, monkeypatch):
+        """Test that NaN and infinities logged by any method survive finalize."""
+        import src.metrics_logger as metrics_logger_module
+        from src.metrics_logger import EnhancedMetricsLogger
+        
+        logged = {
+            'queue': lambda logger: logger.log_queue_metrics(
+                1.0, {'north': {'length_meters': float('inf'), 'vehicle_count': 3, 'density': 0.5, 'is_spillback': False}}
+            ),
+            'pedestrian': lambda logger: logger.log_pedestrian_activity(float('nan'), {'north': 2}),
+            'network': lambda logger: logger.log_network_metrics(1.0, {
+                'average_travel_time': 30.0, 'stops_per_vehicle': 1.0, 'coordination_quality': 0.8,
+                'total_throughput': 10, 'network_delay': float('-inf')
+            }),
+            'vehicle': lambda logger: (logger.track_vehicle(1, 0.0, 'north'), logger.vehicle_departed(1, float('inf')))
+        }
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, log in logged.items():
+                output_path = Path(tmpdir) / f"metrics_{name}.json"
+                logger = EnhancedMetricsLogger(str(output_path))
+                logger.log_density(0.0, {'north': 0.5})
+                assert not logger._non_finite_logged
+                
+                log(logger)
+                assert logger._non_finite_logged, name
+                logger.finalize()
+                
+                # The file parses back with the non-finite value in place of null
+                text = output_path.read_text()
+                assert 'null' not in text.replace('"exit_time": null', ''), name
+                assert 'NaN' in text or 'Infinity' in text, name
+        
+        # Finite values keep the orjson path
+        logger = EnhancedMetricsLogger("unused.json")
+        logger.log_queue_metrics(1.0, {'north': {'length_meters': 12.0, 'vehicle_count': 3, 'density': 0.5}})
+        logger.log_throughput(2.0, 'north', 3)
+        assert not logger._non_finite_logged